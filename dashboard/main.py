@@ -121,7 +121,8 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=300)
+# Shared, not copied: the collector and database manager hold locks, pools and threads
+@st.cache_resource
 def initialize_components():
     """Initialize all components."""
     return {
@@ -138,7 +139,7 @@ def get_real_time_data():
         components = initialize_components()
         db_manager = components['db_manager']
         
-        articles = db_manager.get_articles_by_timeframe(hours_back=24)
+        articles = db_manager.get_articles_frame(hours_back=24)
         engagement_metrics = db_manager.get_engagement_metrics()
         sentiment_data = db_manager.get_sentiment_data()
         
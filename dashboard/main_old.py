@@ -348,6 +348,8 @@ def main():
     # Manual refresh button
     if st.sidebar.button("🔄 Refresh Now", type="primary"):
         st.cache_data.clear()
+        # The pipeline writes from another process, so drop the manager's cached reads too
+        initialize_components()['db_manager'].invalidate_cache()
         st.rerun()
     
     # Data source selection
@@ -0,0 +1,68 @@
+"""
+Async Database Manager
+
+asyncio front end for the DatabaseManager. Each call runs the synchronous
+method on a worker thread sized to the connection pool, so independent
+inserts and queries overlap on their own pooled connections instead of
+blocking the event loop one round trip at a time.
+
+Example:
+    async with AsyncDatabaseManager() as db:
+        await asyncio.gather(*(db.save_article(a, sync=True) for a in articles))
+        stats = await db.get_database_stats()
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from database.database_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseManager:
+    """Awaitable wrapper exposing the public DatabaseManager methods as coroutines."""
+    
+    def __init__(self, config_path: str = "config/config.yaml", db: DatabaseManager = None):
+        """
+        Initialize the async database manager.
+        
+        Args:
+            config_path: Configuration file for a new DatabaseManager
+            db: Existing manager to wrap instead of creating one
+        """
+        self.db = db if db is not None else DatabaseManager(config_path=config_path)
+        # One worker per pooled connection; more would only queue on the pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.db.pool_max,
+            thread_name_prefix='db-async'
+        )
+    
+    def __getattr__(self, name: str):
+        """Wrap public DatabaseManager methods so they run on the worker threads."""
+        attr = getattr(self.db, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        if name.startswith('iter_'):
+            # A generator would run its queries on the event loop thread as it is consumed
+            raise AttributeError(f"{name} streams rows synchronously; use the get_ variant")
+        
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(attr, *args, **kwargs))
+        return call
+    
+    async def close(self):
+        """Flush queued writes, close the wrapped manager and stop the worker threads."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.db.close)
+        self._executor.shutdown(wait=True)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,188 @@
+"""
+Connection Pool
+
+Thread-safe pool of live database connections for the DatabaseManager.
+Connections are opened lazily up to max_size, reused most-recently-released
+first, validated after sitting idle, and closed once idle for too long.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """Bounded pool of connections created by a factory callable."""
+    
+    def __init__(self, factory: Callable[[], Any], min_size: int = 1, max_size: int = 10,
+                 timeout: float = 30, idle_timeout: float = 300, validate_after: float = 30,
+                 reset: Optional[Callable[[Any], None]] = None,
+                 on_close: Optional[Callable[[Any], None]] = None):
+        """
+        Initialize the connection pool.
+        
+        Args:
+            factory: Opens a new connection
+            min_size: Idle connections kept open by fill()
+            max_size: Upper bound on open connections, idle or checked out
+            timeout: Seconds acquire() waits for a connection when the pool is exhausted
+            idle_timeout: Idle connections older than this are closed instead of reused
+            validate_after: Idle connections older than this are pinged with SELECT 1 before reuse
+            reset: Called on release to end any open transaction; raising discards the connection
+            on_close: Called with each connection the pool closes
+        """
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.validate_after = validate_after
+        self.reset = reset
+        self.on_close = on_close
+        
+        # (connection, released_at) pairs; LIFO keeps hot connections in use and lets cold ones expire
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or checked out."""
+        return self._size
+    
+    @property
+    def idle(self) -> int:
+        """Number of idle connections waiting in the pool."""
+        return self._idle.qsize()
+    
+    def fill(self):
+        """Open connections until the pool holds min_size idle connections."""
+        while not self._closed and self._idle.qsize() < self.min_size:
+            if not self._reserve():
+                return
+            try:
+                self._idle.put_nowait((self._open(), time.monotonic()))
+            except Exception:
+                self._unreserve()
+                raise
+    
+    def acquire(self):
+        """
+        Check out a connection, opening one if the pool is below max_size.
+        
+        Raises:
+            RuntimeError: If the pool has been closed
+            TimeoutError: If no connection frees up within timeout seconds
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        
+        while True:
+            try:
+                conn, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._usable(conn, released_at):
+                return conn
+        
+        if self._reserve():
+            try:
+                return self._open()
+            except Exception:
+                self._unreserve()
+                raise
+        
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                conn, released_at = self._idle.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise TimeoutError(f"No database connection available after {self.timeout}s")
+            if self._usable(conn, released_at):
+                return conn
+            # The stale connection freed a slot, so open a replacement
+            if self._reserve():
+                try:
+                    return self._open()
+                except Exception:
+                    self._unreserve()
+                    raise
+    
+    def release(self, conn):
+        """Return a connection to the pool, discarding it if it cannot be reset or the pool is closed."""
+        if self._closed:
+            self.discard(conn)
+            return
+        try:
+            if self.reset is not None:
+                self.reset(conn)
+            self._idle.put_nowait((conn, time.monotonic()))
+        except Exception as e:
+            logger.warning(f"Discarding database connection: {e}")
+            self.discard(conn)
+            return
+        # close() may have drained the idle queue while this connection was being reset
+        if self._closed:
+            self._drain()
+    
+    def discard(self, conn):
+        """Close a connection and free its slot."""
+        self._unreserve()
+        if self.on_close is not None:
+            self.on_close(conn)
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing database connection: {e}")
+    
+    def close(self):
+        """Close all idle connections and refuse new checkouts; checked-out connections are closed on release."""
+        self._closed = True
+        self._drain()
+    
+    def _drain(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self.discard(conn)
+    
+    def _usable(self, conn, released_at: float) -> bool:
+        """Check an idle connection before reuse, discarding it if stale or dead."""
+        idle_for = time.monotonic() - released_at
+        if idle_for > self.idle_timeout:
+            self.discard(conn)
+            return False
+        if idle_for > self.validate_after:
+            try:
+                conn.execute("SELECT 1").fetchone()
+            except Exception as e:
+                logger.warning(f"Discarding dead database connection: {e}")
+                self.discard(conn)
+                return False
+        return True
+    
+    def _open(self):
+        """Open a new connection for a slot already reserved."""
+        return self.factory()
+    
+    def _reserve(self) -> bool:
+        """Claim a slot for a new connection if the pool is below max_size."""
+        with self._lock:
+            if self._size >= self.max_size:
+                return False
+            self._size += 1
+            return True
+    
+    def _unreserve(self):
+        """Free a connection slot."""
+        with self._lock:
+            self._size -= 1
+
@@ -9,14 +9,910 @@ import pyodbc
 import sqlite3
 import logging
 import json
+import queue
+import threading
+import time
+import atexit
+import weakref
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, Set
 import yaml
 import os
+import re
+import copy
+import csv
+import tempfile
+import functools
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from itertools import chain
 from contextlib import contextmanager
 
+from database.connection_pool import ConnectionPool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
+# Connections are pooled by DatabaseManager; the driver manager's own pooling
+# leaks under unixODBC and would double-pool them
+pyodbc.pooling = False
+
+# Parsed configuration files keyed by (absolute path, mtime)
+_CONFIG_CACHE: Dict[tuple, Dict] = {}
+
+# Databases whose schema this process has already created or verified, so later
+# managers for the same database skip the catalog round trips
+_SCHEMA_READY: Set[tuple] = set()
+_SCHEMA_READY_LOCK = threading.Lock()
+
+# Default rows sent per executemany call, capping TDS packet size and transaction log pressure
+_BULK_CHUNK_SIZE = 1000
+
+# Article columns in _article_row order; update_article may set all but the id
+_ARTICLE_COLUMNS = (
+    'id', 'title', 'url', 'summary', 'content', 'published_date', 'source_name', 'source_country',
+    'source_language', 'author', 'tags', 'word_count', 'collected_at'
+)
+_WORD_COUNT_INDEX = _ARTICLE_COLUMNS.index('word_count')
+# MSSQL derives word_count from content in a persisted computed column, so
+# the value is neither bound on insert nor updatable there
+_ARTICLE_INSERT_COLUMNS = {
+    'mssql': _ARTICLE_COLUMNS[:_WORD_COUNT_INDEX] + _ARTICLE_COLUMNS[_WORD_COUNT_INDEX + 1:],
+    'sqlite': _ARTICLE_COLUMNS
+}
+_ARTICLE_UPDATABLE_COLUMNS = {db_type: columns[1:] for db_type, columns in _ARTICLE_INSERT_COLUMNS.items()}
+_ARTICLE_COLUMN_LIST = {db_type: ', '.join(columns) for db_type, columns in _ARTICLE_INSERT_COLUMNS.items()}
+_ARTICLE_PLACEHOLDERS = {db_type: ', '.join('?' * len(columns)) for db_type, columns in _ARTICLE_INSERT_COLUMNS.items()}
+
+# Spaces plus one, for non-empty content
+_MSSQL_WORD_COUNT = (
+    "CAST(CASE WHEN LEN(content) > 0 THEN LEN(content) - LEN(REPLACE(content, ' ', '')) + 1 ELSE 0 END AS INT)"
+)
+
+# Engagement time parsed from the metadata JSON once, when the event is written
+_MSSQL_TIME_SPENT = (
+    "CASE WHEN ISJSON(metadata) = 1 THEN TRY_CAST(JSON_VALUE(metadata, '$.time_spent') AS FLOAT) END"
+)
+_SQLITE_TIME_SPENT = (
+    "CASE WHEN json_valid(metadata) THEN CAST(json_extract(metadata, '$.time_spent') AS REAL) END"
+)
+
+# Persisted computed columns added to tables created before them
+_MSSQL_COMPUTED_COLUMNS = frozenset({'articles.word_count', 'engagement_events.time_spent'})
+
+# Hot-path insert statements, fixed strings so each pooled connection prepares them once
+_INSERT_ARTICLE_SQL = {
+    # The VALUES source lets the existence check reuse the bound id instead of a second copy
+    'mssql': f"""
+        INSERT INTO articles ({_ARTICLE_COLUMN_LIST['mssql']})
+        SELECT * FROM (VALUES ({_ARTICLE_PLACEHOLDERS['mssql']})) AS s ({_ARTICLE_COLUMN_LIST['mssql']})
+        WHERE NOT EXISTS (SELECT 1 FROM articles WITH (UPDLOCK, HOLDLOCK) WHERE id = s.id)
+    """,
+    'sqlite': f"""
+        INSERT INTO articles ({_ARTICLE_COLUMN_LIST['sqlite']})
+        VALUES ({_ARTICLE_PLACEHOLDERS['sqlite']})
+        ON CONFLICT(id) DO NOTHING
+    """
+}
+# Tags are only written for articles stored with this exact tag list, so a
+# skipped existing article keeps its own tags
+_INSERT_ARTICLE_TAGS_SQL = {
+    'mssql': """
+        INSERT INTO article_tags (article_id, tag)
+        SELECT a.id, s.tag FROM (VALUES (?, ?, ?)) AS s (tag, article_id, tags)
+        JOIN articles a ON a.id = s.article_id AND a.tags = s.tags
+        WHERE NOT EXISTS (
+            SELECT 1 FROM article_tags t WITH (UPDLOCK, HOLDLOCK)
+            WHERE t.article_id = s.article_id AND t.tag = s.tag
+        )
+    """,
+    'sqlite': """
+        INSERT INTO article_tags (article_id, tag)
+        SELECT id, ? FROM articles WHERE id = ? AND tags = ?
+        ON CONFLICT(article_id, tag) DO NOTHING
+    """
+}
+_INSERT_SENTIMENT_SQL = """
+    INSERT INTO sentiment_analysis
+    (article_id, sentiment_score, sentiment_label, confidence, language, analyzer_used)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INSERT_EVENT_SQL = """
+    INSERT INTO engagement_events (article_id, user_id, event_type, metadata)
+    VALUES (?, ?, ?, ?)
+"""
+# Metrics snapshots update the existing row in place, keeping its created_at and
+# rowid, rather than deleting and re-inserting it
+_UPSERT_ARTICLE_METRICS_SQL = {
+    'mssql': """
+        MERGE article_metrics WITH (HOLDLOCK) AS target
+        USING (VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)) AS source
+            (total_views, unique_users, clicks, shares, avg_time_on_page,
+             ctr, share_rate, content_score, last_updated, article_id)
+        ON target.article_id = source.article_id
+        WHEN MATCHED THEN
+            UPDATE SET total_views = source.total_views, unique_users = source.unique_users,
+                     clicks = source.clicks, shares = source.shares,
+                     avg_time_on_page = source.avg_time_on_page, ctr = source.ctr,
+                     share_rate = source.share_rate, content_score = source.content_score,
+                     last_updated = source.last_updated
+        WHEN NOT MATCHED THEN
+            INSERT (total_views, unique_users, clicks, shares, avg_time_on_page,
+                   ctr, share_rate, content_score, last_updated, article_id)
+            VALUES (source.total_views, source.unique_users, source.clicks, source.shares,
+                   source.avg_time_on_page, source.ctr, source.share_rate,
+                   source.content_score, source.last_updated, source.article_id);
+    """,
+    'sqlite': """
+        INSERT INTO article_metrics
+        (total_views, unique_users, clicks, shares, avg_time_on_page,
+         ctr, share_rate, content_score, last_updated, article_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(article_id) DO UPDATE SET
+            total_views = excluded.total_views, unique_users = excluded.unique_users,
+            clicks = excluded.clicks, shares = excluded.shares,
+            avg_time_on_page = excluded.avg_time_on_page, ctr = excluded.ctr,
+            share_rate = excluded.share_rate, content_score = excluded.content_score,
+            last_updated = excluded.last_updated
+    """
+}
+# Hot point lookups, also kept prepared per connection
+_SELECT_ARTICLE_SQL = "SELECT * FROM articles WHERE id = ?"
+_SELECT_LATEST_SENTIMENT_SQL = {
+    'mssql': """
+        SELECT TOP 1 * FROM sentiment_analysis
+        WHERE article_id = ?
+        ORDER BY created_at DESC, id DESC
+    """,
+    'sqlite': """
+        SELECT * FROM sentiment_analysis
+        WHERE article_id = ?
+        ORDER BY created_at DESC, id DESC
+        LIMIT 1
+    """
+}
+
+# BACKUP takes the database name and path as bound variables, so the statement text
+# never changes and nothing from the caller is spliced into it; keyed by compression
+_BACKUP_SQL = {
+    compression: f"""
+        DECLARE @database SYSNAME = ?, @path NVARCHAR(4000) = ?;
+        BACKUP DATABASE @database TO DISK = @path
+        WITH COPY_ONLY, {'COMPRESSION, ' if compression else ''}BUFFERCOUNT = 50,
+             MAXTRANSFERSIZE = 4194304, STATS = 10
+    """
+    for compression in (True, False)
+}
+_BACKUP_PATH_PATTERN = re.compile(r'^[^\x00-\x1f]{1,4000}$')
+
+# Statements per pooled connection that keep their own prepared cursor
+_STATEMENT_CACHE_SIZE = 16
+
+# Columns get_top_articles may rank by; metric names are never interpolated unchecked
+_ALLOWED_METRICS = frozenset({'ctr', 'share_rate', 'content_score', 'total_views', 'clicks', 'shares'})
+# Every rankable metric is backed by a descending index so ORDER BY ... TOP needs no sort
+_INDEXED_METRICS = tuple(sorted(_ALLOWED_METRICS))
+# Ranking statements per backend and metric, built once so each stays prepared
+_TOP_ARTICLES_SQL = {
+    **{('mssql', metric): f"""
+        SELECT TOP (?) a.id, a.title, a.source_name, a.published_date, m.{metric}
+        FROM article_metrics m
+        JOIN articles a ON a.id = m.article_id
+        ORDER BY m.{metric} DESC
+    """ for metric in _ALLOWED_METRICS},
+    **{('sqlite', metric): f"""
+        SELECT a.id, a.title, a.source_name, a.published_date, m.{metric}
+        FROM article_metrics m
+        JOIN articles a ON a.id = m.article_id
+        ORDER BY m.{metric} DESC
+        LIMIT ?
+    """ for metric in _ALLOWED_METRICS}
+}
+
+# Newest-first article pages, keyed by backend and whether a limit is bound
+_SELECT_ARTICLES_PAGE_SQL = {
+    ('mssql', False): "SELECT * FROM articles ORDER BY published_date DESC OFFSET ? ROWS",
+    ('mssql', True): "SELECT * FROM articles ORDER BY published_date DESC OFFSET ? ROWS FETCH NEXT ? ROWS ONLY",
+    # SQLite reads LIMIT -1 as no limit, so one statement serves both
+    ('sqlite', False): "SELECT * FROM articles ORDER BY published_date DESC LIMIT ? OFFSET ?",
+    ('sqlite', True): "SELECT * FROM articles ORDER BY published_date DESC LIMIT ? OFFSET ?",
+}
+
+# Rows per multi-row VALUES insert on SQLite, within its bound-variable limit
+# (999 before SQLite 3.32)
+_SQLITE_ROWS_PER_INSERT = 200
+_SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+_VALUES_ROW = re.compile(r'VALUES\s*(\(\?(?:\s*,\s*\?)*\))')
+
+# Longest string, in characters, bound as a sized NVARCHAR rather than NVARCHAR(MAX);
+# at two UTF-16 units per character it stays within NVARCHAR(4000)
+_MAX_SIZED_STRING = 2000
+
+# Rows pulled per fetchmany call when streaming large result sets
+_FETCH_BATCH_SIZE = 1000
+
+# Per-connection SQLite tuning; journal_mode=WAL is persistent and set once at schema creation.
+# Under WAL, synchronous=NORMAL only fsyncs at checkpoints and can lose (not corrupt) the
+# last commits on power failure
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+)
+# Page size for newly created SQLite databases; existing files keep theirs
+_SQLITE_PAGE_SIZE = 8192
+
+# Queued after the last write-behind item to stop the flusher. flush() queues a
+# threading.Event instead, set once everything ahead of it has been written.
+_FLUSH_STOP = object()
+
+# Managers that have started a flusher. Held weakly so the exit hook never keeps
+# a discarded manager, its pools or its thread alive
+_FLUSHING_MANAGERS = weakref.WeakSet()
+
+
+def _stop_flushers():
+    """Write the queued items of every live manager and stop their flushers at exit."""
+    for manager in list(_FLUSHING_MANAGERS):
+        manager._stop_flusher()
+
+
+atexit.register(_stop_flushers)
+
+# Tables and indexes the schema DDL creates on every backend; when all exist the
+# DDL batch is skipped. The optional columnstore index is deliberately absent.
+_SCHEMA_OBJECTS = frozenset({
+    'articles', 'article_tags', 'sentiment_analysis', 'engagement_events', 'article_metrics',
+    'ab_testing', 'idx_articles_collected', 'idx_articles_published', 'idx_ab_test_name',
+    'idx_article_tags_tag', 'idx_sentiment_article_created',
+    'idx_sentiment_date_label', 'idx_engagement_timestamp', 'idx_engagement_date_type',
+    'engagement_daily', 'engagement_users', 'sentiment_daily',
+    *(f'idx_metrics_{metric}' for metric in _INDEXED_METRICS)
+})
+# Rollups are indexed views on MSSQL and trigger-maintained tables on SQLite
+_MSSQL_SCHEMA_OBJECTS = _SCHEMA_OBJECTS | {'ix_engagement_daily', 'ix_engagement_users', 'ix_sentiment_daily'}
+_SQLITE_SCHEMA_OBJECTS = _SCHEMA_OBJECTS | {
+    'trg_engagement_rollup', 'trg_engagement_rollup_delete', 'trg_engagement_rollup_update',
+    'trg_sentiment_rollup', 'trg_sentiment_rollup_delete', 'trg_sentiment_rollup_update'
+}
+
+# Schema DDL, each sent to the server as a single batch. Indexes on the persisted
+# computed columns go through EXEC so the batch still compiles when upgrading
+# a table that predates the column.
+_MSSQL_DDL = """
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='articles' AND xtype='U')
+CREATE TABLE articles (
+    id NVARCHAR(255) PRIMARY KEY,
+    title NVARCHAR(MAX) NOT NULL,
+    url NVARCHAR(1000),
+    summary NVARCHAR(MAX),
+    content NVARCHAR(MAX),
+    published_date DATETIME2(3),
+    source_name NVARCHAR(255),
+    source_country NVARCHAR(100),
+    source_language NVARCHAR(10),
+    author NVARCHAR(255),
+    tags NVARCHAR(MAX),
+    word_count AS """ + _MSSQL_WORD_COUNT + """ PERSISTED,
+    collected_at DATETIME2(3),
+    created_at DATETIME2(3) DEFAULT GETDATE()
+) WITH (DATA_COMPRESSION = PAGE);
+
+-- Tables from before word_count was computed swap the stored column for it
+IF COLUMNPROPERTY(OBJECT_ID('articles'), 'word_count', 'IsComputed') = 0
+BEGIN
+    ALTER TABLE articles DROP COLUMN word_count;
+    EXEC('ALTER TABLE articles ADD word_count AS """ + _MSSQL_WORD_COUNT.replace("'", "''") + """ PERSISTED');
+END;
+
+-- Timeframe windows and newest-first pages range-scan instead of sorting the table
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_articles_collected')
+CREATE INDEX idx_articles_collected ON articles (collected_at DESC);
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_articles_published')
+CREATE INDEX idx_articles_published ON articles (published_date DESC);
+
+-- One row per article tag, so tag filters seek instead of scanning JSON
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='article_tags' AND xtype='U')
+CREATE TABLE article_tags (
+    article_id NVARCHAR(255) NOT NULL,
+    tag NVARCHAR(255) NOT NULL,
+    PRIMARY KEY (article_id, tag),
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_article_tags_tag')
+CREATE INDEX idx_article_tags_tag ON article_tags (tag);
+
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='sentiment_analysis' AND xtype='U')
+CREATE TABLE sentiment_analysis (
+    id INT IDENTITY(1,1) PRIMARY KEY,
+    article_id NVARCHAR(255) NOT NULL,
+    sentiment_score FLOAT,
+    sentiment_label NVARCHAR(50),
+    confidence FLOAT,
+    language NVARCHAR(10),
+    analyzer_used NVARCHAR(100),
+    created_at DATETIME2(3) DEFAULT GETDATE(),
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+-- Latest analysis per article is a seek instead of a sort
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_sentiment_article_created')
+CREATE INDEX idx_sentiment_article_created ON sentiment_analysis (article_id, created_at DESC);
+
+-- Daily trends group by a persisted date column with a matching index
+IF COL_LENGTH('sentiment_analysis', 'created_date') IS NULL
+ALTER TABLE sentiment_analysis ADD created_date AS CAST(created_at AS DATE) PERSISTED;
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_sentiment_date_label')
+EXEC('CREATE INDEX idx_sentiment_date_label ON sentiment_analysis (created_date, sentiment_label)
+      INCLUDE (created_at, sentiment_score)');
+
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='engagement_events' AND xtype='U')
+CREATE TABLE engagement_events (
+    id INT IDENTITY(1,1) PRIMARY KEY,
+    article_id NVARCHAR(255) NOT NULL,
+    user_id NVARCHAR(255),
+    event_type NVARCHAR(50) NOT NULL,
+    timestamp DATETIME2(3) DEFAULT GETDATE(),
+    metadata NVARCHAR(MAX),
+    time_spent AS """ + _MSSQL_TIME_SPENT + """ PERSISTED,
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+IF COL_LENGTH('engagement_events', 'time_spent') IS NULL
+EXEC('ALTER TABLE engagement_events ADD time_spent AS """ + _MSSQL_TIME_SPENT.replace("'", "''") + """ PERSISTED');
+
+-- Recent-window counts (last 24h, last N days) range-seek on timestamp
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_engagement_timestamp')
+CREATE INDEX idx_engagement_timestamp ON engagement_events (timestamp) INCLUDE (event_type);
+
+IF COL_LENGTH('engagement_events', 'event_date') IS NULL
+ALTER TABLE engagement_events ADD event_date AS CAST(timestamp AS DATE) PERSISTED;
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_engagement_date_type')
+EXEC('CREATE INDEX idx_engagement_date_type ON engagement_events (event_date, event_type)
+      INCLUDE (timestamp)');
+
+-- Whole-table rollups (distinct users, per-type counts) run as batch-mode
+-- columnstore scans; updatable nonclustered columnstore needs SQL Server 2016+
+-- and is unavailable on Azure SQL Edge (engine edition 9)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'ix_events_cs')
+   AND CAST(SERVERPROPERTY('ProductMajorVersion') AS INT) >= 13
+   AND CAST(SERVERPROPERTY('EngineEdition') AS INT) <> 9
+CREATE NONCLUSTERED COLUMNSTORE INDEX ix_events_cs
+ON engagement_events (timestamp, event_type, user_id, article_id);
+
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='article_metrics' AND xtype='U')
+CREATE TABLE article_metrics (
+    article_id NVARCHAR(255) PRIMARY KEY,
+    total_views INT DEFAULT 0,
+    unique_users INT DEFAULT 0,
+    clicks INT DEFAULT 0,
+    shares INT DEFAULT 0,
+    avg_time_on_page FLOAT DEFAULT 0,
+    ctr FLOAT DEFAULT 0,
+    share_rate FLOAT DEFAULT 0,
+    content_score FLOAT DEFAULT 0,
+    last_updated DATETIME2(3),
+    created_at DATETIME2(3) DEFAULT GETDATE(),
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+""" + "".join(f"""
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_metrics_{metric}')
+CREATE INDEX idx_metrics_{metric} ON article_metrics ({metric} DESC);
+""" for metric in _INDEXED_METRICS) + """
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='ab_testing' AND xtype='U')
+CREATE TABLE ab_testing (
+    id INT IDENTITY(1,1) PRIMARY KEY,
+    test_name NVARCHAR(255) NOT NULL,
+    variant NVARCHAR(100) NOT NULL,
+    user_id NVARCHAR(255),
+    article_id NVARCHAR(255),
+    conversion_event NVARCHAR(100),
+    timestamp DATETIME2(3) DEFAULT GETDATE(),
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_ab_test_name')
+CREATE INDEX idx_ab_test_name ON ab_testing (test_name, variant);
+
+-- Dashboard totals read these indexed views, which the server keeps current on
+-- every insert, update and delete (dropping groups whose count reaches zero),
+-- instead of scanning the event and analysis tables
+IF OBJECT_ID('engagement_daily', 'V') IS NULL
+EXEC('CREATE VIEW dbo.engagement_daily WITH SCHEMABINDING AS
+      SELECT event_date, event_type, COUNT_BIG(*) AS event_count,
+             SUM(ISNULL(time_spent, 0)) AS time_spent_sum,
+             SUM(CASE WHEN time_spent IS NULL THEN 0 ELSE 1 END) AS time_spent_count
+      FROM dbo.engagement_events
+      GROUP BY event_date, event_type');
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'ix_engagement_daily')
+EXEC('CREATE UNIQUE CLUSTERED INDEX ix_engagement_daily ON dbo.engagement_daily (event_date, event_type)');
+
+IF OBJECT_ID('engagement_users', 'V') IS NULL
+EXEC('CREATE VIEW dbo.engagement_users WITH SCHEMABINDING AS
+      SELECT user_id, COUNT_BIG(*) AS event_count
+      FROM dbo.engagement_events
+      WHERE user_id IS NOT NULL
+      GROUP BY user_id');
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'ix_engagement_users')
+EXEC('CREATE UNIQUE CLUSTERED INDEX ix_engagement_users ON dbo.engagement_users (user_id)');
+
+IF OBJECT_ID('sentiment_daily', 'V') IS NULL
+EXEC('CREATE VIEW dbo.sentiment_daily WITH SCHEMABINDING AS
+      SELECT created_date, sentiment_label, COUNT_BIG(*) AS analysis_count,
+             SUM(ISNULL(sentiment_score, 0)) AS score_sum,
+             SUM(CASE WHEN sentiment_score IS NULL THEN 0 ELSE 1 END) AS scored
+      FROM dbo.sentiment_analysis
+      GROUP BY created_date, sentiment_label');
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'ix_sentiment_daily')
+EXEC('CREATE UNIQUE CLUSTERED INDEX ix_sentiment_daily ON dbo.sentiment_daily (created_date, sentiment_label)');
+"""
+
+_SQLITE_DDL = """
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT,
+    summary TEXT,
+    content TEXT,
+    published_date DATETIME,
+    source_name TEXT,
+    source_country TEXT,
+    source_language TEXT,
+    author TEXT,
+    tags TEXT,
+    word_count INTEGER,
+    collected_at DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Timeframe windows and newest-first pages range-scan instead of sorting the table
+CREATE INDEX IF NOT EXISTS idx_articles_collected ON articles (collected_at DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_date DESC);
+
+-- One row per article tag, so tag filters seek instead of scanning JSON
+CREATE TABLE IF NOT EXISTS article_tags (
+    article_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (article_id, tag),
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_tags_tag ON article_tags (tag, article_id);
+
+CREATE TABLE IF NOT EXISTS sentiment_analysis (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    article_id TEXT NOT NULL,
+    sentiment_score REAL,
+    sentiment_label TEXT,
+    confidence REAL,
+    language TEXT,
+    analyzer_used TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+-- Latest analysis per article is a seek instead of a sort
+CREATE INDEX IF NOT EXISTS idx_sentiment_article_created
+ON sentiment_analysis (article_id, created_at DESC);
+
+-- Daily trends group by DATE(created_at); an expression index avoids the sort
+CREATE INDEX IF NOT EXISTS idx_sentiment_date_label
+ON sentiment_analysis (DATE(created_at), sentiment_label, created_at, sentiment_score);
+
+CREATE TABLE IF NOT EXISTS engagement_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    article_id TEXT NOT NULL,
+    user_id TEXT,
+    event_type TEXT NOT NULL,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    metadata TEXT,
+    time_spent REAL GENERATED ALWAYS AS (""" + _SQLITE_TIME_SPENT + """) STORED,
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+-- Recent-window counts (last 24h, last N days) range-seek on timestamp
+CREATE INDEX IF NOT EXISTS idx_engagement_timestamp
+ON engagement_events (timestamp, event_type);
+
+CREATE INDEX IF NOT EXISTS idx_engagement_date_type
+ON engagement_events (DATE(timestamp), event_type, timestamp);
+
+CREATE TABLE IF NOT EXISTS article_metrics (
+    article_id TEXT PRIMARY KEY,
+    total_views INTEGER DEFAULT 0,
+    unique_users INTEGER DEFAULT 0,
+    clicks INTEGER DEFAULT 0,
+    shares INTEGER DEFAULT 0,
+    avg_time_on_page REAL DEFAULT 0,
+    ctr REAL DEFAULT 0,
+    share_rate REAL DEFAULT 0,
+    content_score REAL DEFAULT 0,
+    last_updated DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+""" + "".join(
+    f"\nCREATE INDEX IF NOT EXISTS idx_metrics_{metric} ON article_metrics ({metric} DESC);\n"
+    for metric in _INDEXED_METRICS
+) + """
+CREATE TABLE IF NOT EXISTS ab_testing (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_name TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    user_id TEXT,
+    article_id TEXT,
+    conversion_event TEXT,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (article_id) REFERENCES articles(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_ab_test_name ON ab_testing (test_name, variant);
+
+-- Dashboard totals read these rollups, kept current by insert, delete and update
+-- triggers, instead of scanning the event and analysis tables. Empty rollups are
+-- backfilled first; rebuild_rollups() recomputes them from scratch.
+CREATE TABLE IF NOT EXISTS engagement_daily (
+    event_date TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    event_count INTEGER NOT NULL,
+    time_spent_sum REAL NOT NULL,
+    time_spent_count INTEGER NOT NULL,
+    PRIMARY KEY (event_date, event_type)
+) WITHOUT ROWID;
+
+INSERT INTO engagement_daily
+SELECT DATE(timestamp), event_type, COUNT(*), COALESCE(SUM(time_spent), 0), COUNT(time_spent)
+FROM engagement_events
+WHERE NOT EXISTS (SELECT 1 FROM engagement_daily)
+GROUP BY DATE(timestamp), event_type;
+
+-- Users are counted by event so a user leaves the rollup with their last event
+CREATE TABLE IF NOT EXISTS engagement_users (
+    user_id TEXT PRIMARY KEY,
+    event_count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+INSERT INTO engagement_users
+SELECT user_id, COUNT(*)
+FROM engagement_events
+WHERE user_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM engagement_users)
+GROUP BY user_id;
+
+CREATE TRIGGER IF NOT EXISTS trg_engagement_rollup AFTER INSERT ON engagement_events
+BEGIN
+    INSERT INTO engagement_daily
+    VALUES (DATE(NEW.timestamp), NEW.event_type, 1, COALESCE(NEW.time_spent, 0), NEW.time_spent IS NOT NULL)
+    ON CONFLICT (event_date, event_type) DO UPDATE SET
+        event_count = event_count + 1,
+        time_spent_sum = time_spent_sum + excluded.time_spent_sum,
+        time_spent_count = time_spent_count + excluded.time_spent_count;
+    INSERT INTO engagement_users SELECT NEW.user_id, 1 WHERE NEW.user_id IS NOT NULL
+    ON CONFLICT (user_id) DO UPDATE SET event_count = event_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_engagement_rollup_delete AFTER DELETE ON engagement_events
+BEGIN
+    UPDATE engagement_daily SET
+        event_count = event_count - 1,
+        time_spent_sum = time_spent_sum - COALESCE(OLD.time_spent, 0),
+        time_spent_count = time_spent_count - (OLD.time_spent IS NOT NULL)
+    WHERE event_date = DATE(OLD.timestamp) AND event_type = OLD.event_type;
+    DELETE FROM engagement_daily
+    WHERE event_date = DATE(OLD.timestamp) AND event_type = OLD.event_type AND event_count <= 0;
+    UPDATE engagement_users SET event_count = event_count - 1 WHERE user_id = OLD.user_id;
+    DELETE FROM engagement_users WHERE user_id = OLD.user_id AND event_count <= 0;
+END;
+
+-- An update moves the row's contribution from its old rollup rows to its new ones
+CREATE TRIGGER IF NOT EXISTS trg_engagement_rollup_update
+AFTER UPDATE OF user_id, event_type, timestamp, metadata ON engagement_events
+BEGIN
+    UPDATE engagement_daily SET
+        event_count = event_count - 1,
+        time_spent_sum = time_spent_sum - COALESCE(OLD.time_spent, 0),
+        time_spent_count = time_spent_count - (OLD.time_spent IS NOT NULL)
+    WHERE event_date = DATE(OLD.timestamp) AND event_type = OLD.event_type;
+    DELETE FROM engagement_daily
+    WHERE event_date = DATE(OLD.timestamp) AND event_type = OLD.event_type AND event_count <= 0;
+    UPDATE engagement_users SET event_count = event_count - 1 WHERE user_id = OLD.user_id;
+    DELETE FROM engagement_users WHERE user_id = OLD.user_id AND event_count <= 0;
+    INSERT INTO engagement_daily
+    VALUES (DATE(NEW.timestamp), NEW.event_type, 1, COALESCE(NEW.time_spent, 0), NEW.time_spent IS NOT NULL)
+    ON CONFLICT (event_date, event_type) DO UPDATE SET
+        event_count = event_count + 1,
+        time_spent_sum = time_spent_sum + excluded.time_spent_sum,
+        time_spent_count = time_spent_count + excluded.time_spent_count;
+    INSERT INTO engagement_users SELECT NEW.user_id, 1 WHERE NEW.user_id IS NOT NULL
+    ON CONFLICT (user_id) DO UPDATE SET event_count = event_count + 1;
+END;
+
+-- NULL labels are stored as '' so the primary key folds them into one row
+CREATE TABLE IF NOT EXISTS sentiment_daily (
+    created_date TEXT NOT NULL,
+    sentiment_label TEXT NOT NULL,
+    analysis_count INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    scored INTEGER NOT NULL,
+    PRIMARY KEY (created_date, sentiment_label)
+) WITHOUT ROWID;
+
+INSERT INTO sentiment_daily
+SELECT DATE(created_at), COALESCE(sentiment_label, ''), COUNT(*),
+       COALESCE(SUM(sentiment_score), 0), COUNT(sentiment_score)
+FROM sentiment_analysis
+WHERE NOT EXISTS (SELECT 1 FROM sentiment_daily)
+GROUP BY DATE(created_at), COALESCE(sentiment_label, '');
+
+CREATE TRIGGER IF NOT EXISTS trg_sentiment_rollup AFTER INSERT ON sentiment_analysis
+BEGIN
+    INSERT INTO sentiment_daily
+    VALUES (DATE(NEW.created_at), COALESCE(NEW.sentiment_label, ''), 1,
+            COALESCE(NEW.sentiment_score, 0), NEW.sentiment_score IS NOT NULL)
+    ON CONFLICT (created_date, sentiment_label) DO UPDATE SET
+        analysis_count = analysis_count + 1,
+        score_sum = score_sum + excluded.score_sum,
+        scored = scored + excluded.scored;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_sentiment_rollup_delete AFTER DELETE ON sentiment_analysis
+BEGIN
+    UPDATE sentiment_daily SET
+        analysis_count = analysis_count - 1,
+        score_sum = score_sum - COALESCE(OLD.sentiment_score, 0),
+        scored = scored - (OLD.sentiment_score IS NOT NULL)
+    WHERE created_date = DATE(OLD.created_at) AND sentiment_label = COALESCE(OLD.sentiment_label, '');
+    DELETE FROM sentiment_daily
+    WHERE created_date = DATE(OLD.created_at) AND sentiment_label = COALESCE(OLD.sentiment_label, '')
+      AND analysis_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_sentiment_rollup_update
+AFTER UPDATE OF created_at, sentiment_label, sentiment_score ON sentiment_analysis
+BEGIN
+    UPDATE sentiment_daily SET
+        analysis_count = analysis_count - 1,
+        score_sum = score_sum - COALESCE(OLD.sentiment_score, 0),
+        scored = scored - (OLD.sentiment_score IS NOT NULL)
+    WHERE created_date = DATE(OLD.created_at) AND sentiment_label = COALESCE(OLD.sentiment_label, '');
+    DELETE FROM sentiment_daily
+    WHERE created_date = DATE(OLD.created_at) AND sentiment_label = COALESCE(OLD.sentiment_label, '')
+      AND analysis_count <= 0;
+    INSERT INTO sentiment_daily
+    VALUES (DATE(NEW.created_at), COALESCE(NEW.sentiment_label, ''), 1,
+            COALESCE(NEW.sentiment_score, 0), NEW.sentiment_score IS NOT NULL)
+    ON CONFLICT (created_date, sentiment_label) DO UPDATE SET
+        analysis_count = analysis_count + 1,
+        score_sum = score_sum + excluded.score_sum,
+        scored = scored + excluded.scored;
+END;
+
+-- Give the planner row counts for indexes added to an existing database
+ANALYZE;
+
+COMMIT;
+"""
+
+# Recomputes the SQLite rollups from the base tables, repairing any drift
+_SQLITE_REBUILD_ROLLUPS = """
+BEGIN IMMEDIATE;
+
+DELETE FROM engagement_daily;
+INSERT INTO engagement_daily
+SELECT DATE(timestamp), event_type, COUNT(*), COALESCE(SUM(time_spent), 0), COUNT(time_spent)
+FROM engagement_events
+GROUP BY DATE(timestamp), event_type;
+
+DELETE FROM engagement_users;
+INSERT INTO engagement_users
+SELECT user_id, COUNT(*) FROM engagement_events WHERE user_id IS NOT NULL GROUP BY user_id;
+
+DELETE FROM sentiment_daily;
+INSERT INTO sentiment_daily
+SELECT DATE(created_at), COALESCE(sentiment_label, ''), COUNT(*),
+       COALESCE(SUM(sentiment_score), 0), COUNT(sentiment_score)
+FROM sentiment_analysis
+GROUP BY DATE(created_at), COALESCE(sentiment_label, '');
+
+COMMIT;
+"""
+
+
+def _article_id(article: Dict) -> str:
+    """Return the article ID, deriving it from the URL like NewsCollector when absent."""
+    if article.get('id'):
+        return article['id']
+    # Same 64-bit BLAKE2b hex digest as NewsCollector._generate_article_id, so the
+    # key is fixed-width and re-ingesting a URL hits the existing row
+    return hashlib.blake2b(article['url'].encode('utf-8'), digest_size=8).hexdigest()
+
+
+@functools.lru_cache(maxsize=64)
+def _column_names(description: tuple) -> tuple:
+    """Column names of a cursor.description, memoised per result-set shape."""
+    return tuple(column[0] for column in description)
+
+
+def _is_missing_database(error: Exception) -> bool:
+    """Whether a connect error is SQL Server's 4060, "Cannot open database"."""
+    message = str(error)
+    return '(4060)' in message or 'Cannot open database' in message
+
+
+@functools.lru_cache(maxsize=32)
+def _multi_row_insert(sql: str) -> tuple:
+    """
+    Rewrite a single-row INSERT ... VALUES (?, ...) to insert several rows at once.
+    
+    Returns:
+        (statement, rows per statement), or (None, 1) for statements without a
+        plain VALUES row, such as INSERT ... SELECT
+    """
+    match = _VALUES_ROW.search(sql)
+    if match is None:
+        return None, 1
+    row = match.group(1)
+    rows = min(_SQLITE_ROWS_PER_INSERT, _SQLITE_MAX_VARIABLES // row.count('?'))
+    return sql[:match.start(1)] + ', '.join([row] * rows) + sql[match.end(1):], rows
+
+
+def _string_input_sizes(rows: List[tuple]) -> List[Optional[tuple]]:
+    """
+    Parameter sizes for a fast_executemany chunk.
+    
+    pyodbc binds strings for NVARCHAR(MAX) columns as streamed data-at-execution
+    values, sent row by row. Sizing each string column to the chunk's longest
+    value keeps it in the parameter array; columns holding a longer string, or
+    no strings, keep pyodbc's own binding.
+    """
+    sizes = []
+    for values in zip(*rows):
+        longest = max((len(value) for value in values if isinstance(value, str)), default=None)
+        if longest is None or longest > _MAX_SIZED_STRING:
+            sizes.append(None)
+        else:
+            sizes.append((pyodbc.SQL_WVARCHAR, max(2 * longest, 1), 0))
+    return sizes
+
+
+def _json_dumps(value) -> str:
+    """
+    Serialise tags/metadata for storage, using orjson's C encoder when installed.
+    
+    Strings and bytes are taken to be JSON the caller already serialised and are
+    stored as they are.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _copy_result(result):
+    """
+    Copy a cached read result for a caller.
+    
+    Cached reads return a list of row dicts or a dict of scalars and flat dicts,
+    so copying the container and the containers it holds keeps callers from
+    altering the cache, at a fraction of deepcopy's cost on large article lists.
+    """
+    if isinstance(result, list):
+        return [item.copy() if isinstance(item, (dict, list)) else item for item in result]
+    if isinstance(result, dict):
+        return {key: value.copy() if isinstance(value, (dict, list)) else value
+                for key, value in result.items()}
+    return result
+
+
+def ttl_cache(seconds: Optional[float] = None, tables: Optional[tuple] = None):
+    """
+    Cache a DatabaseManager read per instance and arguments.
+    
+    Results are reused for `seconds` (default: the manager's cache_ttl) and
+    dropped early by invalidate_cache(), which the save methods call with the
+    tables they wrote after committing. A read declaring its `tables` is only
+    dropped by writes to those tables; one without survives no write. The
+    cache keeps the cache_max_entries most recently used results. Concurrent
+    misses on the same key wait for one refresh instead of each running the
+    query. Callers get a copy of the result's lists and dicts, so mutating a
+    row never alters the cache. Passing refresh=True skips a stored result,
+    e.g. for changes made outside this manager.
+    
+    Queued articles and sentiment results are written before any read, but
+    queued engagement events are not waited for: engagement results can lag
+    them by up to flush_interval_ms. Call flush() first to read them back.
+    """
+    depends_on = None if tables is None else frozenset(tables)
+    
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, refresh: bool = False, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            # Queued articles and sentiment results invalidate the cache when flushed,
+            # so land them before a hit; queued engagement events are not waited for
+            self._await_queued_rows()
+            while True:
+                now = time.monotonic()
+                with self._cache_lock:
+                    entry = self._cache.get(key)
+                    generation = self._cache_generation
+                    if entry is not None and entry[0] > now and not refresh:
+                        self._cache.move_to_end(key)
+                        return _copy_result(entry[2])
+                    refreshing = self._cache_refreshing.get(key)
+                    if refreshing is None:
+                        refreshing = self._cache_refreshing[key] = threading.Event()
+                        break
+                # Another thread is running this query; reuse its result once stored
+                refreshing.wait()
+                refresh = False
+            
+            try:
+                result = func(self, *args, **kwargs)
+                ttl = self.cache_ttl if seconds is None else seconds
+                with self._cache_lock:
+                    # Skip storing a result that a concurrent write may have made stale
+                    if generation == self._cache_generation:
+                        self._cache[key] = (now + ttl, depends_on, result)
+                        self._cache.move_to_end(key)
+                        while len(self._cache) > self.cache_max_entries:
+                            self._cache.popitem(last=False)
+            finally:
+                with self._cache_lock:
+                    del self._cache_refreshing[key]
+                refreshing.set()
+            return _copy_result(result)
+        return wrapper
+    return decorator
+
+
+class _TransactionConnection:
+    """
+    Connection handed to calls made inside DatabaseManager.transaction().
+    
+    commit() is deferred to the end of the transaction, and a failed call marks
+    the whole transaction for rollback instead of undoing it on the spot.
+    Everything else is delegated to the underlying connection.
+    """
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.failed = False
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        self.failed = True
+    
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
 
 class DatabaseManager:
     """
@@ -33,7 +929,8 @@ class DatabaseManager:
     def __init__(self, config_path: str = "config/config.yaml"):
         """Initialize the database manager."""
         self.config = self._load_config(config_path)
-        self.db_config = self.config.get('database', {}).get('development', {})
+        # Empty YAML sections load as None, so fall back to defaults rather than failing
+        self.db_config = (self.config.get('database') or {}).get('development') or {}
         self.db_type = self.db_config.get('type', 'mssql')
         self.server = self.db_config.get('server', 'localhost')
         self.port = self.db_config.get('port', 1433)
@@ -42,41 +939,158 @@ class DatabaseManager:
         self.password = os.getenv('MSSQL_PASSWORD', self.db_config.get('password', ''))
         self.driver = self.db_config.get('driver', 'ODBC Driver 17 for SQL Server')
         self.db_path = 'data/nordic_news.db'
+        # Seconds a SQLite connection waits on another writer's lock before failing
+        self.sqlite_busy_timeout = self.db_config.get('sqlite_busy_timeout', 30)
+        self._conn_str = (
+            f"DRIVER={{{self.driver}}};"
+            f"SERVER={self.server},{self.port};"
+            f"DATABASE={self.database};"
+            f"UID={self.username};"
+            f"PWD={self.password};"
+            "TrustServerCertificate=yes;"
+        )
+        if self.db_config.get('mars', True):
+            # Lets a nested query run while a streamed result set is still open
+            self._conn_str += "MARS_Connection=yes;"
+        
+        self.bulk_chunk_size = self.db_config.get('bulk_chunk_size', _BULK_CHUNK_SIZE)
+        # Directory shared with the SQL Server instance for BULK INSERT files, and its path as the server sees it
+        self.bulk_load_dir = self.db_config.get('bulk_load_dir')
+        self.bulk_load_server_dir = self.db_config.get('bulk_load_server_dir', self.bulk_load_dir)
+        
+        # Connection pool for either backend, filled lazily up to pool_max
+        self.pool_min = self.db_config.get('pool_min', 1)
+        self.pool_max = self.db_config.get('pool_max', 10)
+        self.pool_timeout = self.db_config.get('pool_timeout', 30)
+        self._pool = self._create_pool()
+        # SQLite admits one writer at a time, so its writes queue in-process for a
+        # single dedicated connection instead of spinning on the database lock,
+        # and the pool above serves only reads
+        self._writer_pool = ConnectionPool(
+            # BEGIN IMMEDIATE takes the write lock up front, where the busy timeout
+            # applies, instead of failing to upgrade a read lock mid-transaction
+            factory=lambda: self._connect_sqlite('IMMEDIATE'),
+            min_size=0,
+            max_size=1,
+            timeout=self.pool_timeout,
+            idle_timeout=self.db_config.get('pool_idle_timeout', 300),
+            validate_after=self.db_config.get('pool_validate_after', 30),
+            reset=self._reset_connection,
+            on_close=lambda conn: self._cursors.pop(conn, None)
+        )
+        # Long-lived cursors per pooled connection, keyed by statement, so repeated
+        # statements reuse their prepared handle
+        self._cursors = {}
+        # Connection checked out by the current thread, shared by nested get_connection calls,
+        # and the open transaction() if any
+        self._local = threading.local()
+        
+        # Write-behind buffer of ('article' | 'sentiment' | 'event', payload) items,
+        # drained by a background flusher
+        self.flush_size = self.db_config.get('flush_size', 1000)
+        self.flush_interval_ms = self.db_config.get('flush_interval_ms', 500)
+        # An idle flusher exits so its thread stops referencing the manager; the next write restarts it
+        self.flusher_idle_seconds = self.db_config.get('flusher_idle_seconds', 30)
+        self._write_queue = queue.Queue(maxsize=self.db_config.get('event_queue_max', 100000))
+        # Queued articles and sentiment results, which reads from other threads wait for
+        self._queued_rows = 0
+        # Queued items that failed to write; the save methods already returned True for them
+        self.dropped_writes = 0
+        self._flusher_thread = None
+        self._flusher_lock = threading.Lock()
+        
+        # LRU/TTL cache for hot reads, pruned by the tables each write commits to
+        self.cache_ttl = self.db_config.get('cache_ttl_seconds', 30)
+        self.cache_max_entries = self.db_config.get('cache_max_entries', 1024)
+        self._cache = OrderedDict()
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+        # Events for cache keys being refreshed, so concurrent misses wait for one query
+        self._cache_refreshing = {}
+        
+        # Backups run one at a time on a lazily created worker thread
+        self.backup_dir = self.db_config.get('backup_dir', 'backups')
+        self.backup_compression = self.db_config.get('backup_compression', True)
+        self._backup_executor = None
+        self._backup_lock = threading.Lock()
+        self._backup_progress = None
         
         # Initialize database with fallback
         self._initialize_database()
     
     def _load_config(self, config_path: str) -> Dict:
-        """Load configuration from YAML file."""
+        """Load configuration from YAML file, reusing the parse while the file is unchanged."""
         try:
-            with open(config_path, 'r', encoding='utf-8') as file:
-                return yaml.safe_load(file)
+            cache_key = (os.path.abspath(config_path), os.path.getmtime(config_path))
+            config = _CONFIG_CACHE.get(cache_key)
+            if config is None:
+                with open(config_path, 'r', encoding='utf-8') as file:
+                    config = yaml.load(file, Loader=_YamlLoader) or {}
+                _CONFIG_CACHE[cache_key] = config
+            return copy.deepcopy(config)
         except FileNotFoundError:
             logger.error(f"Configuration file not found: {config_path}")
             return {}
     
-    def _initialize_database(self):
-        """Initialize database tables with MSSQL fallback to SQLite."""
+    def _create_pool(self) -> ConnectionPool:
+        """Create the main connection pool for the current backend."""
+        return ConnectionPool(
+            factory=lambda: self._connect_mssql() if self.db_type == 'mssql' else self._connect_sqlite(),
+            min_size=self.pool_min,
+            max_size=self.pool_max,
+            timeout=self.pool_timeout,
+            idle_timeout=self.db_config.get('pool_idle_timeout', 300),
+            validate_after=self.db_config.get('pool_validate_after', 30),
+            reset=self._reset_connection,
+            on_close=lambda conn: self._cursors.pop(conn, None)
+        )
+    
+    def _initialize_database(self, force: bool = False):
+        """
+        Initialize database tables with MSSQL fallback to SQLite.
+        
+        The schema work runs once per database per process; later managers for
+        the same database only open their connections. Pass force=True to run
+        it again.
+        """
         try:
             # Try MSSQL first
             if self.db_type == 'mssql':
+                key = ('mssql', self.server, self.port, self.database)
                 try:
-                    # First, try to create the database if it doesn't exist
-                    self._ensure_mssql_database_exists()
-                    
-                    # Then connect to the specific database
-                    with self.get_connection() as conn:
-                        self._create_tables_mssql(conn)
+                    if force or key not in _SCHEMA_READY:
+                        # Connect straight to the database; only a missing one
+                        # costs the extra handshake with master to create it
+                        try:
+                            with self.get_connection() as conn:
+                                self._create_tables_mssql(conn)
+                        except pyodbc.Error as e:
+                            if not _is_missing_database(e):
+                                raise
+                            self._ensure_mssql_database_exists()
+                            with self.get_connection() as conn:
+                                self._create_tables_mssql(conn)
+                        with _SCHEMA_READY_LOCK:
+                            _SCHEMA_READY.add(key)
+                    self._pool.fill()
                     logger.info("Successfully connected to MSSQL database")
                     return
                 except Exception as e:
                     logger.warning(f"MSSQL connection failed: {e}. Falling back to SQLite.")
                     self.db_type = 'sqlite'
+                    # A closed pool refuses checkouts, so SQLite gets a fresh one
+                    self._pool.close()
+                    self._pool = self._create_pool()
             
             # Fallback to SQLite
-            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            with self.get_connection() as conn:
-                self._create_tables_sqlite(conn)
+            key = ('sqlite', os.path.abspath(self.db_path))
+            # A deleted database file needs its schema again
+            if force or key not in _SCHEMA_READY or not os.path.exists(self.db_path):
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                with self.get_connection() as conn:
+                    self._create_tables_sqlite(conn)
+                with _SCHEMA_READY_LOCK:
+                    _SCHEMA_READY.add(key)
             logger.info("Successfully connected to SQLite database")
             
         except Exception as e:
@@ -100,10 +1114,15 @@ class DatabaseManager:
                 cursor = master_conn.cursor()
                 
                 # Check if database exists
-                cursor.execute(f"SELECT name FROM sys.databases WHERE name = '{self.database}'")
+                cursor.execute("SELECT name FROM sys.databases WHERE name = ?", (self.database,))
                 if not cursor.fetchone():
                     logger.info(f"Creating database '{self.database}'...")
-                    cursor.execute(f"CREATE DATABASE [{self.database}]")
+                    # DDL cannot bind identifiers, so the name is bracket-quoted like QUOTENAME
+                    quoted_database = '[' + self.database.replace(']', ']]') + ']'
+                    cursor.execute(f"CREATE DATABASE {quoted_database}")
+                    # Autocommit readers see the last committed row version instead of
+                    # waiting on writers' locks
+                    cursor.execute(f"ALTER DATABASE {quoted_database} SET READ_COMMITTED_SNAPSHOT ON")
                     logger.info(f"Database '{self.database}' created successfully")
                 else:
                     logger.info(f"Database '{self.database}' already exists")
@@ -113,416 +1132,1154 @@ class DatabaseManager:
             raise
     
     def _create_tables_mssql(self, conn):
-        """Create tables for MSSQL database."""
+        """Create tables for MSSQL database in one round trip and one transaction."""
         cursor = conn.cursor()
         
-        # Create articles table
+        # One catalog read replaces the per-object existence checks on warm starts
         cursor.execute("""
-            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='articles' AND xtype='U')
-            CREATE TABLE articles (
-                id NVARCHAR(255) PRIMARY KEY,
-                title NVARCHAR(MAX) NOT NULL,
-                url NVARCHAR(1000),
-                summary NVARCHAR(MAX),
-                content NVARCHAR(MAX),
-                published_date DATETIME2,
-                source_name NVARCHAR(255),
-                source_country NVARCHAR(100),
-                source_language NVARCHAR(10),
-                author NVARCHAR(255),
-                tags NVARCHAR(MAX),
-                word_count INT,
-                collected_at DATETIME2,
-                created_at DATETIME2 DEFAULT GETDATE()
-            )
-        """)
-        
-        # Create sentiment_analysis table
-        cursor.execute("""
-            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='sentiment_analysis' AND xtype='U')
-            CREATE TABLE sentiment_analysis (
-                id INT IDENTITY(1,1) PRIMARY KEY,
-                article_id NVARCHAR(255) NOT NULL,
-                sentiment_score FLOAT,
-                sentiment_label NVARCHAR(50),
-                confidence FLOAT,
-                language NVARCHAR(10),
-                analyzer_used NVARCHAR(100),
-                created_at DATETIME2 DEFAULT GETDATE(),
-                FOREIGN KEY (article_id) REFERENCES articles(id)
-            )
-        """)
-        
-        # Create engagement_events table
-        cursor.execute("""
-            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='engagement_events' AND xtype='U')
-            CREATE TABLE engagement_events (
-                id INT IDENTITY(1,1) PRIMARY KEY,
-                article_id NVARCHAR(255) NOT NULL,
-                user_id NVARCHAR(255),
-                event_type NVARCHAR(50) NOT NULL,
-                timestamp DATETIME2 DEFAULT GETDATE(),
-                metadata NVARCHAR(MAX),
-                FOREIGN KEY (article_id) REFERENCES articles(id)
-            )
-        """)
-        
-        # Create ab_testing table
-        cursor.execute("""
-            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='ab_testing' AND xtype='U')
-            CREATE TABLE ab_testing (
-                id INT IDENTITY(1,1) PRIMARY KEY,
-                test_name NVARCHAR(255) NOT NULL,
-                variant NVARCHAR(100) NOT NULL,
-                user_id NVARCHAR(255),
-                article_id NVARCHAR(255),
-                conversion_event NVARCHAR(100),
-                timestamp DATETIME2 DEFAULT GETDATE(),
-                FOREIGN KEY (article_id) REFERENCES articles(id)
-            )
+            SELECT name FROM sys.tables
+            UNION ALL
+            SELECT name FROM sys.views
+            UNION ALL
+            SELECT name FROM sys.indexes WHERE name IS NOT NULL
+            UNION ALL
+            SELECT OBJECT_NAME(object_id) + '.' + name FROM sys.computed_columns
+            WHERE object_id IN (OBJECT_ID('articles'), OBJECT_ID('engagement_events'))
         """)
+        if _MSSQL_SCHEMA_OBJECTS | _MSSQL_COMPUTED_COLUMNS <= {row[0] for row in cursor.fetchall()}:
+            conn.commit()
+            return
         
+        cursor.execute(_MSSQL_DDL)
         conn.commit()
     
     def _create_tables_sqlite(self, conn):
-        """Create tables for SQLite database."""
-        cursor = conn.cursor()
+        """Create tables for SQLite database in one transaction."""
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        if not existing:
+            # Only takes effect on a new file, before the WAL switch writes its header;
+            # larger pages mean fewer page reads for the dashboard's range scans
+            conn.execute(f"PRAGMA page_size = {_SQLITE_PAGE_SIZE}")
+        if self.db_path != ':memory:':
+            # Readers no longer wait behind the writer, and commits append to the log
+            conn.execute("PRAGMA journal_mode = WAL")
         
-        # Create articles table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                url TEXT,
-                summary TEXT,
-                content TEXT,
-                published_date DATETIME,
-                source_name TEXT,
-                source_country TEXT,
-                source_language TEXT,
-                author TEXT,
-                tags TEXT,
-                word_count INTEGER,
-                collected_at DATETIME,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        # SQLite can only add generated columns as VIRTUAL, so tables that predate
+        # time_spent compute it on read rather than re-parsing JSON in every query.
+        # The column goes in first because the rollup backfill and trigger read it.
+        if 'engagement_events' in existing:
+            columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(engagement_events)")}
+            if 'time_spent' not in columns:
+                conn.execute(f"ALTER TABLE engagement_events ADD COLUMN time_spent REAL "
+                             f"GENERATED ALWAYS AS ({_SQLITE_TIME_SPENT}) VIRTUAL")
+                conn.commit()
         
-        # Create sentiment_analysis table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sentiment_analysis (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                article_id TEXT NOT NULL,
-                sentiment_score REAL,
-                sentiment_label TEXT,
-                confidence REAL,
-                language TEXT,
-                analyzer_used TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (article_id) REFERENCES articles(id)
-            )
-        """)
+        # engagement_users gained per-user event counts so deletes can retire users;
+        # the old table and the insert trigger that fills it are recreated below
+        if 'engagement_users' in existing:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(engagement_users)")}
+            if 'event_count' not in columns:
+                conn.execute("DROP TRIGGER IF EXISTS trg_engagement_rollup")
+                conn.execute("DROP TABLE engagement_users")
+                conn.commit()
+                existing -= {'trg_engagement_rollup', 'engagement_users'}
         
-        # Create engagement_events table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS engagement_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                article_id TEXT NOT NULL,
-                user_id TEXT,
-                event_type TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                metadata TEXT,
-                FOREIGN KEY (article_id) REFERENCES articles(id)
-            )
-        """)
+        # Rollups kept by insert triggers alone drift once rows are deleted or updated
+        repair = 'engagement_daily' in existing and 'trg_engagement_rollup_delete' not in existing
+        if not _SQLITE_SCHEMA_OBJECTS <= existing:
+            conn.executescript(_SQLITE_DDL)
+        if repair:
+            conn.executescript(_SQLITE_REBUILD_ROLLUPS)
+    
+    def _get_connection_string(self) -> str:
+        """Get MSSQL connection string (built once in __init__)."""
+        return self._conn_str
+    
+    def _connect_mssql(self):
+        """Open a new MSSQL connection with explicit transactions."""
+        conn = pyodbc.connect(self._get_connection_string())
+        conn.autocommit = False
+        return conn
+    
+    def _connect_sqlite(self, isolation_level: Optional[str] = None):
+        """
+        Open a new SQLite connection, usable from any pool thread.
         
-        # Create ab_testing table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ab_testing (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                test_name TEXT NOT NULL,
-                variant TEXT NOT NULL,
-                user_id TEXT,
-                article_id TEXT,
-                conversion_event TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (article_id) REFERENCES articles(id)
-            )
-        """)
+        Args:
+            isolation_level: BEGIN variant sqlite3 issues before the first write,
+                or None for autocommit (reads never hold a transaction open)
+        """
+        # The busy timeout lets writers queue behind each other instead of failing
+        # Pooled connections live long enough for sqlite3's statement cache to pay off
+        conn = sqlite3.connect(self.db_path, timeout=self.sqlite_busy_timeout, isolation_level=isolation_level,
+                               check_same_thread=False, cached_statements=256)
+        # Rows stay plain tuples: result dicts are zipped from the cursor description,
+        # so a sqlite3.Row per row would only add an allocation
+        if self.db_path != ':memory:':
+            for pragma in _SQLITE_PRAGMAS:
+                conn.execute(pragma)
+        return conn
+    
+    def _reset_connection(self, conn):
+        """End any transaction left open so the next caller starts clean."""
+        if isinstance(conn, sqlite3.Connection):
+            # Each SQLite pool keeps the mode it opened with: autocommit readers, IMMEDIATE writer
+            conn.rollback()
+        elif self._autocommit(conn):
+            self._set_autocommit(conn, False)
+        else:
+            conn.rollback()
+    
+    def _autocommit(self, conn) -> bool:
+        """Whether a connection commits each statement on its own."""
+        if isinstance(conn, sqlite3.Connection):
+            return conn.isolation_level is None
+        return conn.autocommit
+    
+    def _set_autocommit(self, conn, autocommit: bool):
+        """Switch a connection between autocommit and explicit transactions."""
+        if isinstance(conn, sqlite3.Connection):
+            conn.isolation_level = None if autocommit else ''
+        else:
+            conn.autocommit = autocommit
+    
+    def pool_stats(self) -> Dict:
+        """
+        Report connection pool usage: open, idle and in-use connections and the limit.
         
-        conn.commit()
+        On SQLite these describe the reader pool; 'writer_in_use' tells whether
+        the single writer connection is checked out.
+        """
+        stats = {
+            'size': self._pool.size,
+            'idle': self._pool.idle,
+            'in_use': self._pool.size - self._pool.idle,
+            'max_size': self._pool.max_size
+        }
+        if self.db_type == 'sqlite':
+            stats['writer_in_use'] = self._writer_pool.size > self._writer_pool.idle
+        return stats
     
-    def _get_connection_string(self) -> str:
-        """Get MSSQL connection string."""
-        return (
-            f"DRIVER={{{self.driver}}};"
-            f"SERVER={self.server},{self.port};"
-            f"DATABASE={self.database};"
-            f"UID={self.username};"
-            f"PWD={self.password};"
-            "TrustServerCertificate=yes;"
-        )
+    def _cursor(self, conn, sql: Optional[str] = None):
+        """
+        Get a cursor for a checked-out connection.
+        
+        Pooled MSSQL connections keep long-lived cursors: pyodbc re-executes
+        an unchanged statement on the same cursor with its existing prepared
+        handle instead of preparing it again. Passing the statement as `sql`
+        gives it a dedicated cursor (up to _STATEMENT_CACHE_SIZE per
+        connection), so statements that alternate within one transaction
+        each stay prepared. A connection is used by one thread at a time, so
+        its cursors are never shared across threads.
+        """
+        if self.db_type != 'mssql' or getattr(self._local, 'depth', 0) > 1:
+            # Nested use gets its own cursor so the outer result set stays open
+            return conn.cursor()
+        
+        if isinstance(conn, _TransactionConnection):
+            conn = conn.connection
+        cursors = self._cursors.get(conn)
+        if cursors is None:
+            cursors = self._cursors[conn] = OrderedDict()
+        
+        cursor = cursors.get(sql)
+        if cursor is None:
+            cursor = cursors[sql] = conn.cursor()
+            if len(cursors) > _STATEMENT_CACHE_SIZE:
+                _, evicted = cursors.popitem(last=False)
+                evicted.close()
+        else:
+            cursors.move_to_end(sql)
+        return cursor
     
     @contextmanager
-    def get_connection(self):
-        """Get database connection with proper error handling."""
+    def get_connection(self, readonly: bool = False):
+        """
+        Get database connection with proper error handling.
+        
+        A pooled connection is bound to the checking-out thread until the
+        outermost block exits; nested calls on that thread reuse it rather than
+        taking a second pool slot, and no two threads ever share one.
+        
+        Args:
+            readonly: Run in autocommit mode, so each SELECT releases its locks
+                as soon as it completes and no commit or rollback is sent
+        """
+        transaction = getattr(self._local, 'transaction', None)
+        if transaction is not None:
+            # Reads and writes inside transaction() all run on its connection
+            try:
+                yield transaction
+            except Exception:
+                transaction.failed = True
+                raise
+            return
+        
+        held = getattr(self._local, 'conn', None)
+        if held is None:
+            self._await_queued_rows()
+        
+        # A write nested in an autocommit read needs a transaction, so it takes its own connection
+        if held is not None and (readonly or not self._autocommit(held)):
+            self._local.depth += 1
+            try:
+                yield held
+            except Exception:
+                # Undo the nested caller's uncommitted work before the outer block continues
+                if not self._autocommit(held):
+                    held.rollback()
+                raise
+            finally:
+                self._local.depth -= 1
+            return
+        
+        outer_depth = getattr(self._local, 'depth', 0)
         conn = None
         try:
-            if self.db_type == 'mssql':
-                conn = pyodbc.connect(self._get_connection_string())
-                conn.autocommit = False
-            elif self.db_type == 'sqlite':
-                conn = sqlite3.connect(self.db_path)
-                conn.row_factory = sqlite3.Row
-            else:
+            if self.db_type not in ('mssql', 'sqlite'):
                 raise NotImplementedError(f"Database type {self.db_type} not supported")
             
+            pool = self._writer_pool if self.db_type == 'sqlite' and not readonly else self._pool
+            conn = pool.acquire()
+            if readonly:
+                self._set_autocommit(conn, True)
+            self._local.conn = conn
+            self._local.depth = 1
+            
             yield conn
         except Exception as e:
-            if conn:
-                if self.db_type == 'mssql':
-                    conn.rollback()
-                else:
-                    conn.rollback()
             logger.error(f"Database error: {e}")
             raise
         finally:
             if conn:
-                conn.close()
+                self._local.conn = held
+                self._local.depth = outer_depth
+                # Releasing rolls back whatever the block left uncommitted
+                pool.release(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group the writes made on this thread into a single commit.
+        
+        Save and update calls inside the block share one connection and their
+        individual commits are deferred, so the batch pays for one log flush.
+        If the block raises, or any call inside it fails (even one that only
+        reports failure through its return value), everything is rolled back.
+        Saves that are normally queued for the flusher (save_article,
+        save_sentiment_analysis, save_engagement_event) are written straight
+        into the transaction instead. Nested transaction() blocks join the
+        outer one.
+        
+        Raises:
+            RuntimeError: If a call inside the block failed and the transaction was rolled back
+        """
+        if self._in_transaction():
+            yield
+            return
+        
+        self.flush()
+        with self.get_connection() as conn:
+            transaction = self._local.transaction = _TransactionConnection(conn)
+            try:
+                yield
+                if transaction.failed:
+                    raise RuntimeError("Transaction rolled back after a failed database call")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._local.transaction = None
+                # Reads inside the block may have cached uncommitted rows
+                self.invalidate_cache()
+    
+    def _in_transaction(self) -> bool:
+        """Whether this thread is inside a transaction() block."""
+        return getattr(self._local, 'transaction', None) is not None
     
-    def save_article(self, article: Dict) -> bool:
-        """Save an article to the database."""
+    def save_article(self, article: Dict, sync: bool = True) -> bool:
+        """
+        Save an article to the database if it is not already stored.
+        
+        With sync=False the article is queued for the background flusher and
+        written with other queued articles by save_articles_bulk. Any later
+        database access from another thread waits for queued articles first,
+        so reads and dependent rows (metrics, A/B tests) always see them.
+        
+        Args:
+            article: Article dict as produced by the news collector
+            sync: Write immediately and report whether the insert succeeded;
+                False queues the write and returns True before it is stored,
+                so a failed flush is only logged and counted in dropped_writes
+        """
+        if sync or self._in_transaction():
+            return self.save_articles_bulk([article]) == 1
+        
+        self._enqueue_write('article', article)
+        return True
+    
+    def save_articles_bulk(self, articles: List[Dict]) -> int:
+        """
+        Insert many articles in a single transaction, skipping IDs already stored.
+        
+        Rows are sent with executemany in chunks of bulk_chunk_size; on MSSQL
+        fast_executemany binds each chunk as parameter arrays in one round trip.
+        Existing articles are left untouched; use update_article to refresh one.
+        
+        Returns:
+            Number of distinct articles now stored (0 if the batch failed and was rolled back)
+        """
+        if not articles:
+            return 0
+        
         try:
+            rows, tag_rows = self._article_rows(articles)
+            
+            with self.get_connection() as conn:
+                sql = _INSERT_ARTICLE_SQL[self.db_type]
+                self._executemany(self._cursor(conn, sql), sql, rows)
+                
+                self._insert_article_tags(conn, tag_rows)
+                conn.commit()
+            self.invalidate_cache('articles')
+            return len(rows)
+                
+        except Exception as e:
+            logger.error(f"Error saving {len(articles)} articles: {e}")
+            return 0
+    
+    def bulk_load_articles(self, articles: List[Dict], backfill: bool = False) -> int:
+        """
+        Load a large batch of articles through MSSQL BULK INSERT.
+        
+        The rows are written as a UTF-8 CSV file under bulk_load_dir, a directory
+        the SQL Server instance can also read (as bulk_load_server_dir). The file
+        is bulk-loaded into a session temp table, then copied into articles with
+        the same skip-existing semantics as save_articles_bulk. Falls back to
+        save_articles_bulk on SQLite, when bulk_load_dir is not configured, or
+        if the bulk load fails.
+        
+        Args:
+            articles: Articles to load
+            backfill: Run the load inside bulk_load_context(), suspending the
+                secondary indexes until it finishes; only for historical loads
+                while nothing else reads the tables
+        
+        Returns:
+            Number of distinct articles now stored (0 if the batch failed)
+        """
+        if not articles:
+            return 0
+        if backfill:
+            with self.bulk_load_context():
+                return self.bulk_load_articles(articles)
+        if self.db_type != 'mssql' or not self.bulk_load_dir:
+            return self.save_articles_bulk(articles)
+        
+        path = None
+        try:
+            rows, tag_rows = self._article_rows(articles)
+            
+            fd, path = tempfile.mkstemp(prefix='articles_', suffix='.csv', dir=self.bulk_load_dir)
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f, lineterminator='\n').writerows(rows)
+            server_path = os.path.join(self.bulk_load_server_dir, os.path.basename(path)).replace("'", "''")
+            
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                
+                cursor.execute(f"SELECT TOP 0 {_ARTICLE_COLUMN_LIST['mssql']} INTO #article_staging FROM articles")
+                try:
+                    # Minimally logged load; empty unquoted fields arrive as NULL
+                    cursor.execute(f"""
+                        BULK INSERT #article_staging FROM '{server_path}'
+                        WITH (FORMAT = 'CSV', FIELDQUOTE = '"', CODEPAGE = '65001',
+                              ROWTERMINATOR = '0x0a', KEEPNULLS, TABLOCK, BATCHSIZE = 100000)
+                    """)
+                    cursor.execute(f"""
+                        INSERT INTO articles ({_ARTICLE_COLUMN_LIST['mssql']})
+                        SELECT s.* FROM #article_staging s
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM articles a WITH (UPDLOCK, HOLDLOCK) WHERE a.id = s.id
+                        )
+                    """)
+                    self._insert_article_tags(conn, tag_rows)
+                    conn.commit()
+                finally:
+                    cursor.execute("DROP TABLE IF EXISTS #article_staging")
+            self.invalidate_cache('articles')
+            return len(rows)
+                
+        except Exception as e:
+            logger.warning(f"Bulk load of {len(articles)} articles failed: {e}. Falling back to batched inserts.")
+            return self.save_articles_bulk(articles)
+        finally:
+            if path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    @contextmanager
+    def bulk_load_context(self, tables: tuple = ('articles', 'article_tags')):
+        """
+        Suspend secondary indexes on the given tables for a large backfill.
+        
+        Non-unique nonclustered indexes are disabled (MSSQL) or dropped (SQLite)
+        on entry and rebuilt in one sort per index on exit, instead of being
+        updated row by row during the load. On MSSQL a FULL recovery model is
+        switched to BULK_LOGGED for the duration so BULK INSERT is minimally
+        logged. SQLite statistics for the tables are refreshed with ANALYZE
+        afterwards. Other sessions should not query these tables meanwhile.
+        
+        Example:
+            with db.bulk_load_context():
+                db.bulk_load_articles(articles)
+        """
+        self.flush()
+        restore_recovery = False
+        
+        with self._ddl_connection() as conn:
+            cursor = conn.cursor()
+            
+            placeholders = ', '.join('?' * len(tables))
+            if self.db_type == 'mssql':
+                cursor.execute(f"""
+                    SELECT name, OBJECT_NAME(object_id) FROM sys.indexes
+                    WHERE OBJECT_NAME(object_id) IN ({placeholders})
+                    AND type_desc = 'NONCLUSTERED' AND is_unique = 0 AND is_disabled = 0
+                """, tables)
+                indexes = [(row[0], row[1]) for row in cursor.fetchall()]
+                cursor.execute("SELECT recovery_model_desc FROM sys.databases WHERE name = DB_NAME()")
+                restore_recovery = cursor.fetchone()[0] == 'FULL'
+                
+                database = '[' + self.database.replace(']', ']]') + ']'
+                if restore_recovery:
+                    cursor.execute(f"ALTER DATABASE {database} SET RECOVERY BULK_LOGGED")
+                for name, table in indexes:
+                    cursor.execute(f"ALTER INDEX [{name}] ON [{table}] DISABLE")
+            else:
+                cursor.execute(f"""
+                    SELECT name, sql, tbl_name FROM sqlite_master
+                    WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+                """, tables)
+                rows = cursor.fetchall()
+                indexes = [(row[0], row[1]) for row in rows]
+                suspended_tables = sorted({row[2] for row in rows})
+                for name, _ in indexes:
+                    cursor.execute(f'DROP INDEX "{name}"')
+        
+        logger.info(f"Suspended {len(indexes)} indexes for bulk load")
+        try:
+            yield
+        finally:
+            self.flush()
+            with self._ddl_connection() as conn:
+                cursor = conn.cursor()
+                
+                if self.db_type == 'mssql':
+                    for name, table in indexes:
+                        cursor.execute(f"ALTER INDEX [{name}] ON [{table}] REBUILD WITH (MAXDOP = 0)")
+                    if restore_recovery:
+                        cursor.execute(f"ALTER DATABASE {database} SET RECOVERY FULL")
+                else:
+                    for _, sql in indexes:
+                        cursor.execute(sql)
+                    # Dropping an index discards its statistics, so the planner needs them back
+                    for table in suspended_tables:
+                        cursor.execute(f'ANALYZE "{table}"')
+            logger.info(f"Rebuilt {len(indexes)} indexes after bulk load")
+    
+    def _article_rows(self, articles: List[Dict]) -> tuple:
+        """Build article rows and article_tags insert rows, keeping the first copy of each ID."""
+        rows = []
+        tag_rows = []
+        seen_ids = set()
+        for article in articles:
+            article_id = _article_id(article)
+            if article_id not in seen_ids:
+                seen_ids.add(article_id)
+                row = self._article_row(article)
+                rows.append(row)
+                tag_rows.extend(
+                    (tag, row[0], row[10])
+                    for _, tag in self._tag_rows(row[0], article.get('tags'))
+                )
+        return rows, tag_rows
+    
+    def _insert_article_tags(self, conn, tag_rows: List[tuple]):
+        """Insert (tag, article_id, tags_json) rows into article_tags."""
+        sql = _INSERT_ARTICLE_TAGS_SQL[self.db_type]
+        self._executemany(self._cursor(conn, sql), sql, tag_rows)
+    
+    def update_article(self, article_id: str, fields: Dict) -> bool:
+        """
+        Update selected columns of a stored article.
+        
+        Args:
+            article_id: ID of the article to refresh
+            fields: Column values to set; keys must be in this backend's _ARTICLE_UPDATABLE_COLUMNS
+            
+        Returns:
+            True if the article exists and was updated
+            
+        Raises:
+            ValueError: If fields names a column that cannot be updated
+        """
+        updatable = _ARTICLE_UPDATABLE_COLUMNS[self.db_type]
+        unknown = set(fields) - set(updatable)
+        if unknown:
+            raise ValueError(f"Cannot update article columns: {', '.join(sorted(unknown))}")
+        if not fields:
+            return False
+        
+        try:
+            columns = [column for column in updatable if column in fields]
+            values = []
+            for column in columns:
+                value = fields[column]
+                if column == 'tags' and isinstance(value, (list, tuple)):
+                    value = _json_dumps(list(value))
+                values.append(value)
+            
             with self.get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = self._cursor(conn)
                 
-                if self.db_type == 'mssql':
-                    cursor.execute("""
-                        MERGE articles AS target
-                        USING (SELECT ? AS id) AS source
-                        ON target.id = source.id
-                        WHEN MATCHED THEN
-                            UPDATE SET title = ?, url = ?, summary = ?, content = ?,
-                                     published_date = ?, source_name = ?, source_country = ?,
-                                     source_language = ?, author = ?, tags = ?, word_count = ?,
-                                     collected_at = ?
-                        WHEN NOT MATCHED THEN
-                            INSERT (id, title, url, summary, content, published_date,
-                                   source_name, source_country, source_language, author,
-                                   tags, word_count, collected_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-                    """, (
-                        article['id'], article['title'], article['url'], article['summary'],
-                        article['content'], article['published_date'], article['source_name'],
-                        article['source_country'], article['source_language'], article['author'],
-                        article['tags'], article['word_count'], article['collected_at'],
-                        article['id'], article['title'], article['url'], article['summary'],
-                        article['content'], article['published_date'], article['source_name'],
-                        article['source_country'], article['source_language'], article['author'],
-                        article['tags'], article['word_count'], article['collected_at']
-                    ))
-                else:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO articles 
-                        (id, title, url, summary, content, published_date, source_name,
-                         source_country, source_language, author, tags, word_count, collected_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        article['id'], article['title'], article['url'], article['summary'],
-                        article['content'], article['published_date'], article['source_name'],
-                        article['source_country'], article['source_language'], article['author'],
-                        article['tags'], article['word_count'], article['collected_at']
-                    ))
+                # Column names come from the whitelist above, never from the caller
+                assignments = ', '.join(f"{column} = ?" for column in columns)
+                cursor.execute(f"UPDATE articles SET {assignments} WHERE id = ?", (*values, article_id))
+                updated = cursor.rowcount > 0
+                
+                if updated and 'tags' in fields:
+                    cursor.execute("DELETE FROM article_tags WHERE article_id = ?", (article_id,))
+                    self._executemany(
+                        cursor,
+                        "INSERT INTO article_tags (article_id, tag) VALUES (?, ?)",
+                        self._tag_rows(article_id, fields['tags'])
+                    )
                 
                 conn.commit()
-                return True
+            if updated:
+                self.invalidate_cache('articles')
+            return updated
                 
         except Exception as e:
-            logger.error(f"Error saving article: {e}")
+            logger.error(f"Error updating article: {e}")
             return False
     
+    def _article_row(self, article: Dict) -> tuple:
+        """Build the articles parameter tuple, storing tag lists as JSON."""
+        tags = article.get('tags')
+        if isinstance(tags, (list, tuple)):
+            tags = _json_dumps(list(tags))
+        
+        row = (
+            _article_id(article), article['title'], article.get('url'), article.get('summary'),
+            article.get('content'), self._timestamp(article.get('published_date')),
+            article.get('source_name'), article.get('source_country'), article.get('source_language'),
+            article.get('author'), tags, article.get('word_count'),
+            self._timestamp(article.get('collected_at'))
+        )
+        if self.db_type == 'mssql':
+            # word_count is computed from content on the server
+            row = row[:_WORD_COUNT_INDEX] + row[_WORD_COUNT_INDEX + 1:]
+        return row
+    
+    def _timestamp(self, value):
+        """
+        Convert a timestamp for binding, parsing ISO strings once.
+        
+        MSSQL receives a datetime, which pyodbc sends as SQL_TYPE_TIMESTAMP into
+        the DATETIME2(3) columns. SQLite has no datetime type, so it gets text in
+        the same format as its own datetime() and CURRENT_TIMESTAMP, which keeps
+        comparisons against those correct. Aware values become local naive time,
+        like the collector's parsed dates.
+        """
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return value
+        if not isinstance(value, datetime):
+            return value
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value if self.db_type == 'mssql' else value.isoformat(sep=' ')
+    
+    def _tag_rows(self, article_id: str, tags) -> List[tuple]:
+        """Build distinct (article_id, tag) rows for the article_tags table."""
+        if not isinstance(tags, (list, tuple)):
+            return []
+        
+        rows = []
+        seen_tags = set()
+        for tag in tags:
+            tag = str(tag).strip()[:255]
+            if tag and tag not in seen_tags:
+                seen_tags.add(tag)
+                rows.append((article_id, tag))
+        return rows
+    
+    def _executemany(self, cursor, sql: str, rows: List[tuple]):
+        """Execute a parameterised statement for many rows in bulk_chunk_size chunks."""
+        if self.db_type != 'mssql':
+            # Whole blocks go through one prepared multi-row statement, so SQLite
+            # steps once per block rather than once per row; the rest go singly
+            multi_sql, per_statement = _multi_row_insert(sql)
+            blocked = len(rows) - len(rows) % per_statement if multi_sql else 0
+            if blocked:
+                cursor.executemany(multi_sql, (
+                    tuple(chain.from_iterable(rows[start:start + per_statement]))
+                    for start in range(0, blocked, per_statement)
+                ))
+            if blocked < len(rows):
+                cursor.executemany(sql, rows[blocked:])
+            return
+        
+        # Send each chunk as one parameter-array RPC instead of a round trip per row
+        cursor.fast_executemany = True
+        try:
+            for start in range(0, len(rows), self.bulk_chunk_size):
+                chunk = rows[start:start + self.bulk_chunk_size]
+                cursor.setinputsizes(_string_input_sizes(chunk))
+                cursor.executemany(sql, chunk)
+        finally:
+            # The cursor is cached per statement; single-row executes size their own values
+            cursor.setinputsizes(None)
+    
+    def _fetch_dicts(self, cursor) -> List[Dict]:
+        """Fetch all remaining rows as dicts keyed by cursor.description column names."""
+        # Batched fetches never hold the raw rows and their dicts at the same time
+        return list(self._stream_dicts(cursor, _FETCH_BATCH_SIZE))
+    
+    def _fetch_dict(self, cursor) -> Optional[Dict]:
+        """Fetch the next row as a dict, or None if the result set is empty."""
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip(_column_names(tuple(cursor.description)), row))
+    
     def get_article(self, article_id: str) -> Optional[Dict]:
         """Get an article by ID."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
-                row = cursor.fetchone()
-                
-                if row:
-                    if self.db_type == 'mssql':
-                        return dict(zip([column[0] for column in cursor.description], row))
-                    else:
-                        return dict(row)
-                return None
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn, _SELECT_ARTICLE_SQL)
+                cursor.execute(_SELECT_ARTICLE_SQL, (article_id,))
+                return self._fetch_dict(cursor)
                 
         except Exception as e:
             logger.error(f"Error getting article: {e}")
             return None
     
+    @ttl_cache(tables=('articles',))
     def get_articles(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Get articles with pagination."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM articles 
-                    ORDER BY published_date DESC 
-                    LIMIT ? OFFSET ?
-                """, (limit, offset))
-                rows = cursor.fetchall()
-                
-                if self.db_type == 'mssql':
-                    return [dict(zip([column[0] for column in cursor.description], row)) for row in rows]
-                else:
-                    return [dict(row) for row in rows]
-                
+            return list(self.iter_articles(limit=limit, offset=offset))
         except Exception as e:
             logger.error(f"Error getting articles: {e}")
             return []
     
-    def get_articles_by_timeframe(self, hours_back: int = 24) -> List[Dict]:
-        """Get articles within a specified time window."""
+    def iter_articles(self, limit: Optional[int] = None, offset: int = 0,
+                      batch_size: int = _FETCH_BATCH_SIZE) -> Iterator[Dict]:
+        """
+        Stream articles newest first, optionally bounded by limit.
+        
+        Rows are fetched batch_size at a time over the driver's forward-only
+        result set, so large exports run in constant memory. The connection
+        stays checked out until the iterator is exhausted or closed.
+        """
+        sql = _SELECT_ARTICLES_PAGE_SQL[self.db_type, limit is not None]
+        if self.db_type == 'mssql':
+            params = (offset,) if limit is None else (offset, limit)
+        else:
+            params = (-1 if limit is None else limit, offset)
+        
+        with self._stream_connection() as conn:
+            cursor = self._cursor(conn, sql)
+            cursor.execute(sql, params)
+            
+            yield from self._stream_dicts(cursor, batch_size)
+    
+    def get_articles_by_tag(self, tag: str, limit: int = 100) -> List[Dict]:
+        """Get the newest articles carrying a tag."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn)
                 
                 if self.db_type == 'mssql':
                     cursor.execute("""
-                        SELECT a.*, s.sentiment_score, s.sentiment_label, s.confidence
-                        FROM articles a
-                        LEFT JOIN sentiment_analysis s ON a.id = s.article_id
-                        WHERE a.collected_at >= DATEADD(hour, -?, GETDATE())
-                        ORDER BY a.collected_at DESC
-                    """, (hours_back,))
+                        SELECT TOP (?) a.* FROM article_tags t
+                        JOIN articles a ON a.id = t.article_id
+                        WHERE t.tag = ?
+                        ORDER BY a.published_date DESC
+                    """, (limit, tag))
                 else:
                     cursor.execute("""
-                        SELECT a.*, s.sentiment_score, s.sentiment_label, s.confidence
-                        FROM articles a
-                        LEFT JOIN sentiment_analysis s ON a.id = s.article_id
-                        WHERE a.collected_at >= datetime('now', '-{} hours')
-                        ORDER BY a.collected_at DESC
-                    """.format(hours_back))
+                        SELECT a.* FROM article_tags t
+                        JOIN articles a ON a.id = t.article_id
+                        WHERE t.tag = ?
+                        ORDER BY a.published_date DESC
+                        LIMIT ?
+                    """, (tag, limit))
                 
-                rows = cursor.fetchall()
-                
-                if self.db_type == 'mssql':
-                    return [dict(zip([column[0] for column in cursor.description], row)) for row in rows]
-                else:
-                    return [dict(row) for row in rows]
+                return self._fetch_dicts(cursor)
                 
         except Exception as e:
-            logger.error(f"Error getting articles by timeframe: {e}")
+            logger.error(f"Error getting articles by tag: {e}")
             return []
     
-    def save_sentiment_analysis(self, article_id: str, sentiment_data: Dict) -> bool:
-        """Save sentiment analysis results."""
+    def get_articles_by_timeframe(self, hours_back: int = 24) -> List[Dict]:
+        """Get articles within a specified time window."""
         try:
+            return list(self.iter_articles_by_timeframe(hours_back))
+        except Exception as e:
+            logger.error(f"Error getting articles by timeframe: {e}")
+            return []
+    
+    def iter_articles_by_timeframe(self, hours_back: int = 24) -> Iterator[Dict]:
+        """
+        Stream articles within a specified time window.
+        
+        Rows are fetched _FETCH_BATCH_SIZE at a time, so neither the driver nor
+        the caller has to buffer the whole result set. The connection stays
+        checked out until the iterator is exhausted or closed.
+        """
+        with self._stream_connection() as conn:
+            cursor = self._cursor(conn)
+            cursor.execute(*self._timeframe_query(hours_back))
+            
+            yield from self._stream_dicts(cursor, _FETCH_BATCH_SIZE)
+    
+    @contextmanager
+    def _ddl_connection(self):
+        """
+        Check out a connection for schema and maintenance statements.
+        
+        SQLite runs them on the single writer connection, queued behind other
+        writes, and commits when the block ends. MSSQL takes a pooled connection
+        of its own in autocommit mode, since ALTER DATABASE and BACKUP cannot
+        run inside a transaction; it is not bound to the thread, so it never
+        switches an outer block's connection out of its transaction.
+        """
+        if self.db_type != 'mssql':
             with self.get_connection() as conn:
-                cursor = conn.cursor()
+                yield conn
+                conn.commit()
+            return
+        
+        conn = self._pool.acquire()
+        try:
+            self._set_autocommit(conn, True)
+            yield conn
+        finally:
+            self._pool.release(conn)
+    
+    @contextmanager
+    def _stream_connection(self):
+        """
+        Check out an autocommit reader connection for a streaming generator.
+        
+        A suspended generator can outlive other calls on its thread, including
+        another stream, so its connection is never bound to the thread the way
+        get_connection() binds one; calls made while it is paused take their
+        own. It also runs outside any open transaction() and does not see that
+        transaction's uncommitted writes.
+        """
+        self._await_queued_rows()
+        conn = self._pool.acquire()
+        try:
+            self._set_autocommit(conn, True)
+            yield conn
+        finally:
+            self._pool.release(conn)
+    
+    def _stream_dicts(self, cursor, batch_size: int) -> Iterator[Dict]:
+        """Yield the cursor's rows as dicts, fetching batch_size rows per call."""
+        cursor.arraysize = batch_size
+        # Column names are resolved once for the whole result set
+        columns = _column_names(tuple(cursor.description))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+    
+    def get_articles_frame(self, hours_back: int = 24, dtype_backend: Optional[str] = None):
+        """
+        Get articles within a specified time window as a pandas DataFrame.
+        
+        pandas builds the columns directly from the fetched rows, so callers
+        that only aggregate or plot skip the per-row dict construction. The
+        query runs on a cursor rather than through pd.read_sql_query, which
+        only accepts SQLAlchemy or sqlite3 connections, so the same path works
+        for pyodbc and inside transaction().
+        
+        Args:
+            hours_back: Size of the collected_at window
+            dtype_backend: 'pyarrow' for Arrow-backed columns that downstream
+                analytics can take without conversion (needs the optional
+                'arrow' extra; without it NumPy dtypes are returned), or
+                'numpy_nullable'; default NumPy dtypes when None
+            
+        Raises:
+            Exception: Database errors propagate, so a failed query is never
+                mistaken for an empty window
+        """
+        import pandas as pd
+        
+        if dtype_backend == 'pyarrow':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                logger.warning("pyarrow is not installed; returning NumPy-backed columns")
+                dtype_backend = None
+        
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn)
+                cursor.execute(*self._timeframe_query(hours_back))
+                # coerce_float turns pyodbc Decimals into floats, as read_sql_query did
+                frame = pd.DataFrame.from_records(cursor.fetchall(), columns=_column_names(tuple(cursor.description)),
+                                                  coerce_float=True)
+        except Exception as e:
+            logger.error(f"Error getting articles by timeframe: {e}")
+            raise
+        
+        if dtype_backend is not None:
+            frame = frame.convert_dtypes(dtype_backend=dtype_backend)
+        return frame
+    
+    def _timeframe_query(self, hours_back: int) -> tuple:
+        """Build the SQL and parameters for articles collected in the last hours_back hours."""
+        if self.db_type == 'mssql':
+            return """
+                SELECT a.*, s.sentiment_score, s.sentiment_label, s.confidence
+                FROM articles a
+                LEFT JOIN sentiment_analysis s ON a.id = s.article_id
+                WHERE a.collected_at >= DATEADD(hour, -?, GETDATE())
+                ORDER BY a.collected_at DESC
+            """, (hours_back,)
+        return """
+            SELECT a.*, s.sentiment_score, s.sentiment_label, s.confidence
+            FROM articles a
+            LEFT JOIN sentiment_analysis s ON a.id = s.article_id
+            WHERE a.collected_at >= datetime('now', ?)
+            ORDER BY a.collected_at DESC
+        """, (f"-{float(hours_back)} hours",)
+    
+    def get_article_sentiment(self, article_id: str) -> Optional[Dict]:
+        """Get the most recent sentiment analysis for an article."""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                sql = _SELECT_LATEST_SENTIMENT_SQL[self.db_type]
+                cursor = self._cursor(conn, sql)
+                cursor.execute(sql, (article_id,))
+                return self._fetch_dict(cursor)
                 
-                if self.db_type == 'mssql':
-                    cursor.execute("""
-                        INSERT INTO sentiment_analysis 
-                        (article_id, sentiment_score, sentiment_label, confidence, language, analyzer_used)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        article_id, sentiment_data.get('sentiment_score'),
-                        sentiment_data.get('sentiment_label'), sentiment_data.get('confidence'),
-                        sentiment_data.get('language'), sentiment_data.get('analyzer_used')
-                    ))
-                else:
-                    cursor.execute("""
-                        INSERT INTO sentiment_analysis 
-                        (article_id, sentiment_score, sentiment_label, confidence, language, analyzer_used)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        article_id, sentiment_data.get('sentiment_score'),
-                        sentiment_data.get('sentiment_label'), sentiment_data.get('confidence'),
-                        sentiment_data.get('language'), sentiment_data.get('analyzer_used')
-                    ))
+        except Exception as e:
+            logger.error(f"Error getting article sentiment: {e}")
+            return None
+    
+    def save_sentiment_analysis(self, article_id: str, sentiment_data: Dict, sync: bool = True) -> bool:
+        """
+        Save sentiment analysis results.
+        
+        Like save_article, sync=False queues the result for the background
+        flusher, which writes it after the articles queued before it.
+        
+        Args:
+            article_id: ID of the analysed article
+            sentiment_data: Analyzer output with sentiment_score, sentiment_label, etc.
+            sync: Write immediately and report whether the insert succeeded;
+                False queues the write and returns True before it is stored
+        """
+        analysis = {**sentiment_data, 'article_id': article_id}
+        if sync or self._in_transaction():
+            return self.save_sentiment_analyses_bulk([analysis]) == 1
+        
+        self._enqueue_write('sentiment', analysis)
+        return True
+    
+    def save_sentiment_analyses_bulk(self, analyses: List[Dict]) -> int:
+        """
+        Insert many sentiment analysis results in a single transaction.
+        
+        Args:
+            analyses: Dicts with article_id and the analyzer's sentiment fields
+            
+        Returns:
+            Number of results saved (0 if the batch failed and was rolled back)
+        """
+        if not analyses:
+            return 0
+        
+        try:
+            rows = [
+                (
+                    analysis['article_id'], analysis.get('sentiment_score'),
+                    analysis.get('sentiment_label'), analysis.get('confidence'),
+                    analysis.get('language'), analysis.get('analyzer_used')
+                )
+                for analysis in analyses
+            ]
+            
+            with self.get_connection() as conn:
+                self._executemany(self._cursor(conn, _INSERT_SENTIMENT_SQL), _INSERT_SENTIMENT_SQL, rows)
                 
                 conn.commit()
-                return True
+            self.invalidate_cache('sentiment_analysis')
+            return len(rows)
                 
         except Exception as e:
-            logger.error(f"Error saving sentiment analysis: {e}")
-            return False
+            logger.error(f"Error saving {len(analyses)} sentiment analyses: {e}")
+            return 0
     
     def save_engagement_event(self, article_id: str, user_id: str, event_type: str, metadata: Dict = None) -> bool:
-        """Save an engagement event."""
+        """
+        Queue an engagement event for the background flusher.
+        
+        The event is written within flush_interval_ms by save_engagement_events_bulk;
+        call flush() to wait until it is stored. Blocks only when event_queue_max
+        events are already waiting. Metadata is serialised on the flusher thread;
+        an already-serialised JSON str or bytes is stored unchanged.
+        
+        Returns:
+            True once the event is queued; an event that later fails to write is
+            logged and counted in dropped_writes. Inside transaction() the event
+            is written at once and the result reports whether the insert succeeded.
+        """
+        event = {
+            'article_id': article_id,
+            'user_id': user_id,
+            'event_type': event_type,
+            'metadata': metadata
+        }
+        if self._in_transaction():
+            return self.save_engagement_events_bulk([event]) == 1
+        
+        self._write_queue.put(('event', event))
+        self._ensure_flusher()
+        return True
+    
+    def _ensure_flusher(self):
+        """
+        Start the write-behind flusher thread if it is not already running.
+        
+        Called after putting an item on the queue: an idle flusher only exits
+        while the queue is empty, so the item is either seen by the running
+        thread or finds it gone here and starts a new one.
+        """
+        with self._flusher_lock:
+            if self._flusher_thread is None or not self._flusher_thread.is_alive():
+                self._flusher_thread = threading.Thread(
+                    target=self._flush_loop,
+                    name='db-write-behind',
+                    daemon=True
+                )
+                self._flusher_thread.start()
+                _FLUSHING_MANAGERS.add(self)
+    
+    def _flush_loop(self):
+        """Write queued items in batches of up to flush_size or every flush_interval_ms."""
+        while True:
+            batch = []
+            waiters = []
+            stop = False
+            
+            # Wait for the first item, then collect more until the batch is full, due,
+            # or a flush() caller is waiting
+            try:
+                item = self._write_queue.get(timeout=self.flusher_idle_seconds)
+            except queue.Empty:
+                with self._flusher_lock:
+                    # Leave only while nothing is queued and no _stop_flusher() is about to queue a stop
+                    if self._write_queue.empty() and self._flusher_thread is threading.current_thread():
+                        self._flusher_thread = None
+                        return
+                continue
+            if item is _FLUSH_STOP:
+                stop = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                batch.append(item)
+                deadline = time.monotonic() + self.flush_interval_ms / 1000
+                while len(batch) < self.flush_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._write_queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _FLUSH_STOP:
+                        stop = True
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                        break
+                    batch.append(item)
+            
+            if batch:
+                self._write_batch(batch)
+            
+            # Everything queued ahead of these flush() calls has now been written
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+    
+    def _write_batch(self, batch: List[tuple]):
+        """Write a batch of queued items on one connection, articles first for foreign keys."""
+        articles = [payload for kind, payload in batch if kind == 'article']
+        analyses = [payload for kind, payload in batch if kind == 'sentiment']
+        events = [payload for kind, payload in batch if kind == 'event']
+        dropped = 0
+        
+        try:
+            # Nested get_connection calls in the bulk methods share this checkout
+            with self.get_connection():
+                if articles:
+                    # A rejected batch is retried one article at a time so a single bad
+                    # row does not discard the rest
+                    if not self.save_articles_bulk(articles):
+                        saved = 0
+                        if len(articles) > 1:
+                            saved = sum(self.save_articles_bulk([article]) for article in articles)
+                        dropped += len(articles) - saved
+                        logger.error(f"Dropped {len(articles) - saved} articles after a failed flush")
+                if analyses and not self.save_sentiment_analyses_bulk(analyses):
+                    dropped += len(analyses)
+                    logger.error(f"Dropped {len(analyses)} sentiment analyses after a failed flush")
+                if events and not self.save_engagement_events_bulk(events):
+                    dropped += len(events)
+                    logger.error(f"Dropped {len(events)} engagement events after a failed flush")
+        except Exception as e:
+            dropped = len(batch)
+            logger.error(f"Error flushing {len(batch)} queued writes: {e}")
+        finally:
+            with self._flusher_lock:
+                self._queued_rows -= len(articles) + len(analyses)
+                self.dropped_writes += dropped
+    
+    def _enqueue_write(self, kind: str, payload: Dict):
+        """Queue an article or sentiment result for the flusher, counting it for read barriers."""
+        with self._flusher_lock:
+            self._queued_rows += 1
+        self._write_queue.put((kind, payload))
+        self._ensure_flusher()
+    
+    def flush(self):
+        """
+        Block until every write queued before the call has been written.
+        
+        Writes other threads queue afterwards are not waited for, so steady
+        event traffic never holds up a flush.
+        """
+        if self._flusher_thread is not None:
+            # The marker also cuts the current batch short instead of waiting out flush_interval_ms
+            written = threading.Event()
+            self._write_queue.put(written)
+            self._ensure_flusher()
+            written.wait()
+    
+    def _await_queued_rows(self):
+        """Flush before touching the database while articles or sentiment results are queued."""
+        if self._queued_rows and threading.current_thread() is not self._flusher_thread:
+            self.flush()
+    
+    def _stop_flusher(self):
+        """Write the remaining queued items and stop the flusher thread."""
+        with self._flusher_lock:
+            thread = self._flusher_thread
+            self._flusher_thread = None
+        if thread is not None and thread.is_alive():
+            self._write_queue.put(_FLUSH_STOP)
+            thread.join()
+        _FLUSHING_MANAGERS.discard(self)
+    
+    def save_engagement_events_bulk(self, events: List[Dict]) -> int:
+        """
+        Insert many engagement events in a single transaction.
+        
+        Args:
+            events: Dicts with article_id, event_type and optional user_id/metadata
+                (a dict, or JSON already serialised as str or bytes)
+            
+        Returns:
+            Number of events saved (0 if the batch failed and was rolled back)
+        """
+        if not events:
+            return 0
+        
         try:
+            rows = [
+                (
+                    event['article_id'], event.get('user_id'), event['event_type'],
+                    _json_dumps(event['metadata']) if event.get('metadata') else None
+                )
+                for event in events
+            ]
+            
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                metadata_json = json.dumps(metadata) if metadata else None
-                
-                cursor.execute("""
-                    INSERT INTO engagement_events (article_id, user_id, event_type, metadata)
-                    VALUES (?, ?, ?, ?)
-                """, (article_id, user_id, event_type, metadata_json))
+                self._executemany(self._cursor(conn, _INSERT_EVENT_SQL), _INSERT_EVENT_SQL, rows)
                 
                 conn.commit()
-                return True
+            self.invalidate_cache('engagement_events')
+            return len(rows)
                 
         except Exception as e:
-            logger.error(f"Error saving engagement event: {e}")
-            return False
+            logger.error(f"Error saving {len(events)} engagement events: {e}")
+            return 0
     
+    @ttl_cache(tables=('engagement_events',))
     def get_engagement_metrics(self) -> Dict:
         """Get engagement metrics."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get total users
-                cursor.execute("SELECT COUNT(DISTINCT user_id) FROM engagement_events WHERE user_id IS NOT NULL")
-                total_users = cursor.fetchone()[0] or 0
-                
-                # Get total events
-                cursor.execute("SELECT COUNT(*) FROM engagement_events")
-                total_events = cursor.fetchone()[0] or 0
-                
-                # Get engagement rate (clicks/views)
-                cursor.execute("""
-                    SELECT 
-                        SUM(CASE WHEN event_type = 'view' THEN 1 ELSE 0 END) as views,
-                        SUM(CASE WHEN event_type = 'click' THEN 1 ELSE 0 END) as clicks
-                    FROM engagement_events
-                """)
-                result = cursor.fetchone()
-                views = result[0] or 0
-                clicks = result[1] or 0
-                engagement_rate = (clicks / views * 100) if views > 0 else 0
-                
-                # Get average time on page
-                if self.db_type == 'mssql':
-                    cursor.execute("""
-                        SELECT AVG(CAST(JSON_VALUE(metadata, '$.time_spent') AS FLOAT))
-                        FROM engagement_events 
-                        WHERE event_type = 'time_on_page' AND metadata IS NOT NULL
-                    """)
-                else:
-                    cursor.execute("""
-                        SELECT AVG(CAST(JSON_EXTRACT(metadata, '$.time_spent') AS REAL))
-                        FROM engagement_events 
-                        WHERE event_type = 'time_on_page' AND metadata IS NOT NULL
-                    """)
-                avg_time_result = cursor.fetchone()
-                avg_time_on_page = avg_time_result[0] if avg_time_result[0] else 0
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn)
                 
-                # Get events in last 24 hours
+                # Totals come from the per-day rollups; only the 24h count touches
+                # engagement_events, as a range seek on its timestamp index
                 if self.db_type == 'mssql':
                     cursor.execute("""
-                        SELECT COUNT(*) FROM engagement_events 
-                        WHERE timestamp >= DATEADD(hour, -24, GETDATE())
+                        SELECT 
+                            (SELECT COUNT(*) FROM engagement_users WITH (NOEXPAND)) as total_users,
+                            SUM(event_count) as total_events,
+                            SUM(CASE WHEN event_type = 'view' THEN event_count ELSE 0 END) as views,
+                            SUM(CASE WHEN event_type = 'click' THEN event_count ELSE 0 END) as clicks,
+                            SUM(CASE WHEN event_type = 'time_on_page' THEN time_spent_sum END)
+                                / NULLIF(SUM(CASE WHEN event_type = 'time_on_page' THEN time_spent_count END), 0)
+                                as avg_time_on_page,
+                            (SELECT COUNT(*) FROM engagement_events
+                             WHERE timestamp >= DATEADD(hour, -24, GETDATE())) as events_24h
+                        FROM engagement_daily WITH (NOEXPAND)
                     """)
                 else:
                     cursor.execute("""
-                        SELECT COUNT(*) FROM engagement_events 
-                        WHERE timestamp >= datetime('now', '-24 hours')
+                        SELECT 
+                            (SELECT COUNT(*) FROM engagement_users) as total_users,
+                            SUM(event_count) as total_events,
+                            SUM(CASE WHEN event_type = 'view' THEN event_count ELSE 0 END) as views,
+                            SUM(CASE WHEN event_type = 'click' THEN event_count ELSE 0 END) as clicks,
+                            SUM(CASE WHEN event_type = 'time_on_page' THEN time_spent_sum END)
+                                / NULLIF(SUM(CASE WHEN event_type = 'time_on_page' THEN time_spent_count END), 0)
+                                as avg_time_on_page,
+                            (SELECT COUNT(*) FROM engagement_events
+                             WHERE timestamp >= datetime('now', '-24 hours')) as events_24h
+                        FROM engagement_daily
                     """)
-                events_24h = cursor.fetchone()[0] or 0
+                result = cursor.fetchone()
+                total_users = result[0] or 0
+                total_events = result[1] or 0
+                views = result[2] or 0
+                clicks = result[3] or 0
+                engagement_rate = (clicks / views * 100) if views > 0 else 0
+                avg_time_on_page = result[4] or 0
+                events_24h = result[5] or 0
                 
                 return {
                     'total_users': total_users,
@@ -542,28 +2299,32 @@ class DatabaseManager:
                 'total_events_24h': 0
             }
     
+    @ttl_cache(tables=('sentiment_analysis',))
     def get_sentiment_data(self) -> Dict:
         """Get sentiment analysis data."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn)
                 
-                # Get sentiment distribution
-                cursor.execute("""
-                    SELECT sentiment_label, COUNT(*) as count
-                    FROM sentiment_analysis
-                    GROUP BY sentiment_label
-                """)
-                sentiment_dist = dict(cursor.fetchall())
-                
-                # Get average sentiment score
-                cursor.execute("""
-                    SELECT AVG(sentiment_score) as avg_score
-                    FROM sentiment_analysis
-                    WHERE sentiment_score IS NOT NULL
-                """)
-                avg_score_result = cursor.fetchone()
-                avg_sentiment_score = avg_score_result[0] if avg_score_result[0] else 0
+                # Distribution and the average score from the per-day rollup
+                if self.db_type == 'mssql':
+                    cursor.execute("""
+                        SELECT sentiment_label, SUM(analysis_count) as count,
+                               SUM(score_sum) as score_sum, SUM(scored) as scored
+                        FROM sentiment_daily WITH (NOEXPAND)
+                        GROUP BY sentiment_label
+                    """)
+                else:
+                    cursor.execute("""
+                        SELECT NULLIF(sentiment_label, '') as sentiment_label, SUM(analysis_count) as count,
+                               SUM(score_sum) as score_sum, SUM(scored) as scored
+                        FROM sentiment_daily
+                        GROUP BY sentiment_label
+                    """)
+                rows = cursor.fetchall()
+                sentiment_dist = {row[0]: row[1] for row in rows}
+                scored = sum(row[3] for row in rows)
+                avg_sentiment_score = sum(row[2] or 0 for row in rows) / scored if scored else 0
                 
                 return {
                     'sentiment_distribution': sentiment_dist,
@@ -577,11 +2338,61 @@ class DatabaseManager:
                 'average_sentiment_score': 0
             }
     
+    def update_article_metrics(self, article_id: str, metrics: Dict) -> bool:
+        """Upsert the engagement metrics snapshot for an article."""
+        try:
+            last_updated = self._timestamp(metrics.get('last_updated') or datetime.now())
+            
+            row = (
+                int(metrics.get('total_views', 0)), int(metrics.get('unique_users', 0)),
+                int(metrics.get('clicks', 0)), int(metrics.get('shares', 0)),
+                float(metrics.get('avg_time_on_page', 0)), float(metrics.get('ctr', 0)),
+                float(metrics.get('share_rate', 0)), float(metrics.get('content_score', 0)),
+                last_updated, article_id
+            )
+            
+            sql = _UPSERT_ARTICLE_METRICS_SQL[self.db_type]
+            with self.get_connection() as conn:
+                self._cursor(conn, sql).execute(sql, row)
+                conn.commit()
+            self.invalidate_cache('article_metrics')
+            return True
+                
+        except Exception as e:
+            logger.error(f"Error updating article metrics: {e}")
+            return False
+    
+    @ttl_cache(tables=('articles', 'article_metrics'))
+    def get_top_articles(self, metric: str = 'content_score', limit: int = 10) -> List[Dict]:
+        """
+        Get the articles ranking highest on an engagement metric.
+        
+        Args:
+            metric: One of _ALLOWED_METRICS
+            limit: Maximum number of articles to return
+            
+        Raises:
+            ValueError: If metric is not a rankable column
+        """
+        if metric not in _ALLOWED_METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+        
+        try:
+            sql = _TOP_ARTICLES_SQL[self.db_type, metric]
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn, sql)
+                cursor.execute(sql, (limit,))
+                return self._fetch_dicts(cursor)
+                
+        except Exception as e:
+            logger.error(f"Error getting top articles: {e}")
+            return []
+    
     def save_ab_test(self, test_name: str, variant: str, user_id: str, article_id: str = None, conversion_event: str = None) -> bool:
         """Save A/B test data."""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = self._cursor(conn)
                 
                 cursor.execute("""
                     INSERT INTO ab_testing (test_name, variant, user_id, article_id, conversion_event)
@@ -589,7 +2400,8 @@ class DatabaseManager:
                 """, (test_name, variant, user_id, article_id, conversion_event))
                 
                 conn.commit()
-                return True
+            self.invalidate_cache('ab_testing')
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving A/B test: {e}")
@@ -598,8 +2410,8 @@ class DatabaseManager:
     def get_ab_test_results(self, test_name: str) -> Dict:
         """Get A/B test results."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn)
                 
                 cursor.execute("""
                     SELECT variant, COUNT(*) as participants,
@@ -625,88 +2437,319 @@ class DatabaseManager:
             logger.error(f"Error getting A/B test results: {e}")
             return {}
     
+    @ttl_cache(tables=('engagement_events',))
     def get_engagement_trends(self, days: int = 7) -> List[Dict]:
         """Get engagement trends over specified days."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn)
                 
+                # Whole days come from the rollup; only the partial day at the start of
+                # the window is counted from engagement_events
                 if self.db_type == 'mssql':
                     cursor.execute("""
-                        SELECT 
-                            CAST(timestamp AS DATE) as date,
-                            event_type,
-                            COUNT(*) as count
+                        SELECT event_date as date, event_type, event_count as count
+                        FROM engagement_daily WITH (NOEXPAND)
+                        WHERE event_date > CAST(DATEADD(day, -?, GETDATE()) AS DATE)
+                        UNION ALL
+                        SELECT event_date, event_type, COUNT(*)
                         FROM engagement_events
-                        WHERE timestamp >= DATEADD(day, -?, GETDATE())
-                        GROUP BY CAST(timestamp AS DATE), event_type
+                        WHERE event_date = CAST(DATEADD(day, -?, GETDATE()) AS DATE)
+                          AND timestamp >= DATEADD(day, -?, GETDATE())
+                        GROUP BY event_date, event_type
                         ORDER BY date DESC
-                    """, (days,))
+                    """, (days, days, days))
                 else:
+                    window = f"-{float(days)} days"
                     cursor.execute("""
-                        SELECT 
-                            DATE(timestamp) as date,
-                            event_type,
-                            COUNT(*) as count
+                        SELECT event_date as date, event_type, event_count as count
+                        FROM engagement_daily
+                        WHERE event_date > DATE('now', ?)
+                        UNION ALL
+                        SELECT DATE(timestamp), event_type, COUNT(*)
                         FROM engagement_events
-                        WHERE timestamp >= datetime('now', '-{} days')
+                        WHERE DATE(timestamp) = DATE('now', ?)
+                          AND timestamp >= datetime('now', ?)
                         GROUP BY DATE(timestamp), event_type
                         ORDER BY date DESC
-                    """.format(days))
-                
-                rows = cursor.fetchall()
+                    """, (window, window, window))
                 
-                if self.db_type == 'mssql':
-                    return [dict(zip([column[0] for column in cursor.description], row)) for row in rows]
-                else:
-                    return [dict(row) for row in rows]
+                return self._fetch_dicts(cursor)
                 
         except Exception as e:
             logger.error(f"Error getting engagement trends: {e}")
             return []
     
+    @ttl_cache(tables=('sentiment_analysis',))
     def get_sentiment_trends(self, days: int = 7) -> List[Dict]:
         """Get sentiment trends over specified days."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn)
                 
+                # As for engagement: whole days from the rollup, the first partial
+                # day averaged from sentiment_analysis
                 if self.db_type == 'mssql':
                     cursor.execute("""
-                        SELECT 
-                            CAST(s.created_at AS DATE) as date,
-                            s.sentiment_label,
-                            AVG(s.sentiment_score) as avg_score,
-                            COUNT(*) as count
-                        FROM sentiment_analysis s
-                        WHERE s.created_at >= DATEADD(day, -?, GETDATE())
-                        GROUP BY CAST(s.created_at AS DATE), s.sentiment_label
+                        SELECT created_date as date, sentiment_label,
+                               score_sum / NULLIF(scored, 0) as avg_score, analysis_count as count
+                        FROM sentiment_daily WITH (NOEXPAND)
+                        WHERE created_date > CAST(DATEADD(day, -?, GETDATE()) AS DATE)
+                        UNION ALL
+                        SELECT created_date, sentiment_label, AVG(sentiment_score), COUNT(*)
+                        FROM sentiment_analysis
+                        WHERE created_date = CAST(DATEADD(day, -?, GETDATE()) AS DATE)
+                          AND created_at >= DATEADD(day, -?, GETDATE())
+                        GROUP BY created_date, sentiment_label
                         ORDER BY date DESC
-                    """, (days,))
+                    """, (days, days, days))
                 else:
+                    window = f"-{float(days)} days"
                     cursor.execute("""
-                        SELECT 
-                            DATE(s.created_at) as date,
-                            s.sentiment_label,
-                            AVG(s.sentiment_score) as avg_score,
-                            COUNT(*) as count
-                        FROM sentiment_analysis s
-                        WHERE s.created_at >= datetime('now', '-{} days')
-                        GROUP BY DATE(s.created_at), s.sentiment_label
+                        SELECT created_date as date, NULLIF(sentiment_label, '') as sentiment_label,
+                               score_sum / NULLIF(scored, 0) as avg_score, analysis_count as count
+                        FROM sentiment_daily
+                        WHERE created_date > DATE('now', ?)
+                        UNION ALL
+                        SELECT DATE(created_at), sentiment_label, AVG(sentiment_score), COUNT(*)
+                        FROM sentiment_analysis
+                        WHERE DATE(created_at) = DATE('now', ?)
+                          AND created_at >= datetime('now', ?)
+                        GROUP BY DATE(created_at), sentiment_label
                         ORDER BY date DESC
-                    """.format(days))
+                    """, (window, window, window))
                 
-                rows = cursor.fetchall()
+                return self._fetch_dicts(cursor)
+                
+        except Exception as e:
+            logger.error(f"Error getting sentiment trends: {e}")
+            return []
+    
+    @ttl_cache(tables=('articles', 'sentiment_analysis', 'engagement_events'))
+    def get_database_stats(self) -> Dict:
+        """Get overall row counts and averages for pipeline reports and quality checks."""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self._cursor(conn)
                 
+                # All aggregates in one round trip; the event and analysis figures come
+                # from the daily rollups rather than scanning those tables
                 if self.db_type == 'mssql':
-                    return [dict(zip([column[0] for column in cursor.description], row)) for row in rows]
+                    cursor.execute("""
+                        SELECT
+                            (SELECT COUNT(*) FROM articles),
+                            (SELECT SUM(analysis_count) FROM sentiment_daily WITH (NOEXPAND)),
+                            (SELECT SUM(event_count) FROM engagement_daily WITH (NOEXPAND)),
+                            (SELECT COUNT(*) FROM engagement_users WITH (NOEXPAND)),
+                            (SELECT SUM(score_sum) / NULLIF(SUM(scored), 0) FROM sentiment_daily WITH (NOEXPAND))
+                    """)
                 else:
-                    return [dict(row) for row in rows]
+                    cursor.execute("""
+                        SELECT
+                            (SELECT COUNT(*) FROM articles),
+                            (SELECT SUM(analysis_count) FROM sentiment_daily),
+                            (SELECT SUM(event_count) FROM engagement_daily),
+                            (SELECT COUNT(*) FROM engagement_users),
+                            (SELECT SUM(score_sum) / NULLIF(SUM(scored), 0) FROM sentiment_daily)
+                    """)
+                (total_articles, total_sentiment_analyses, total_engagement_events,
+                 unique_users, average_sentiment_score) = cursor.fetchone()
+                
+                return {
+                    'total_articles': total_articles or 0,
+                    'total_sentiment_analyses': total_sentiment_analyses or 0,
+                    'total_engagement_events': total_engagement_events or 0,
+                    'unique_users': unique_users or 0,
+                    'average_sentiment_score': round(average_sentiment_score or 0, 3)
+                }
                 
         except Exception as e:
-            logger.error(f"Error getting sentiment trends: {e}")
-            return []
+            logger.error(f"Error getting database stats: {e}")
+            return {
+                'total_articles': 0,
+                'total_sentiment_analyses': 0,
+                'total_engagement_events': 0,
+                'unique_users': 0,
+                'average_sentiment_score': 0
+            }
+    
+    def backup_database(self, backup_path: Optional[str] = None, wait: bool = True):
+        """
+        Back up the database.
+        
+        MSSQL runs a compressed copy-only BACKUP DATABASE, so the backup does
+        not disturb the log backup chain; SQLite copies the file with the
+        online backup API. The backup runs on a background thread.
+        
+        Args:
+            backup_path: Destination file; MSSQL resolves relative paths against the
+                server's default backup directory. Defaults to a timestamped file name.
+            wait: Block until the backup finishes and return whether it succeeded;
+                when False, return a Future to poll with backup_status()
+            
+        Raises:
+            ValueError: If backup_path is empty, too long or contains control characters
+        """
+        if backup_path is not None and not _BACKUP_PATH_PATTERN.match(backup_path):
+            raise ValueError(f"Invalid backup path: {backup_path!r}")
+        if backup_path is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            if self.db_type == 'mssql':
+                backup_path = f"{self.database}_{timestamp}.bak"
+            else:
+                backup_path = os.path.join(self.backup_dir, f"nordic_news_{timestamp}.db")
+        
+        # Include writes still queued for the background flusher
+        self.flush()
+        with self._backup_lock:
+            if self._backup_executor is None:
+                self._backup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-backup')
+            future = self._backup_executor.submit(self._run_backup, backup_path)
+        
+        return future.result() if wait else future
+    
+    def _run_backup(self, backup_path: str) -> bool:
+        """Write a backup to backup_path, returning whether it succeeded."""
+        try:
+            if self.db_type == 'mssql':
+                # BACKUP cannot run inside a transaction, so use an autocommit connection
+                with self._ddl_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(_BACKUP_SQL[bool(self.backup_compression)], (self.database, backup_path))
+                    # The backup only completes once every progress message is consumed
+                    while cursor.nextset():
+                        pass
+            else:
+                self._backup_progress = 0.0
+                os.makedirs(os.path.dirname(os.path.abspath(backup_path)), exist_ok=True)
+                source = sqlite3.connect(self.db_path)
+                target = sqlite3.connect(backup_path)
+                try:
+                    source.backup(target, pages=1024, progress=self._record_backup_progress)
+                finally:
+                    target.close()
+                    source.close()
+                self._backup_progress = 100.0
+            
+            logger.info(f"Database backed up to {backup_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error backing up database: {e}")
+            return False
+    
+    def _record_backup_progress(self, status, remaining: int, total: int):
+        """Track SQLite backup progress for backup_status()."""
+        self._backup_progress = 100.0 * (total - remaining) / total if total else 100.0
+    
+    def backup_status(self, future: Future) -> Dict:
+        """
+        Report progress of a backup started with backup_database(wait=False).
+        
+        Returns:
+            Dict with done, success (None while running) and percent_complete
+        """
+        percent_complete = 100.0 if future.done() else None
+        if not future.done():
+            if self.db_type == 'mssql':
+                try:
+                    with self.get_connection(readonly=True) as conn:
+                        cursor = self._cursor(conn)
+                        cursor.execute("""
+                            SELECT percent_complete FROM sys.dm_exec_requests
+                            WHERE command = 'BACKUP DATABASE' AND database_id = DB_ID()
+                        """)
+                        row = cursor.fetchone()
+                        percent_complete = float(row[0]) if row else None
+                except Exception as e:
+                    logger.warning(f"Error reading backup progress: {e}")
+            else:
+                percent_complete = self._backup_progress
+        
+        return {
+            'done': future.done(),
+            'success': future.result() if future.done() else None,
+            'percent_complete': percent_complete
+        }
+    
+    def invalidate_cache(self, *tables: str):
+        """Drop cached read results that depend on the given tables, or all results if none are given."""
+        with self._cache_lock:
+            if tables:
+                for key, (_, depends_on, _) in list(self._cache.items()):
+                    if depends_on is None or not depends_on.isdisjoint(tables):
+                        del self._cache[key]
+            else:
+                self._cache.clear()
+            self._cache_generation += 1
+    
+    def rebuild_rollups(self) -> bool:
+        """
+        Recompute the daily engagement and sentiment rollups from their base tables.
+        
+        Triggers keep the SQLite rollups current on every insert, delete and
+        update, so this only repairs drift, such as rows changed while the
+        triggers were missing. MSSQL maintains its indexed views itself, so
+        nothing is done there.
+        
+        Returns:
+            True if the rollups are consistent with the base tables
+        """
+        if self.db_type == 'mssql':
+            logger.info("MSSQL maintains its rollup views itself")
+            return True
+        
+        self.flush()
+        try:
+            with self._ddl_connection() as conn:
+                conn.executescript(_SQLITE_REBUILD_ROLLUPS)
+            self.invalidate_cache('engagement_events', 'sentiment_analysis')
+            return True
+        except Exception as e:
+            logger.error(f"Error rebuilding rollups: {e}")
+            return False
+    
+    def compress_tables(self, tables: tuple = ('articles',)) -> Dict[str, tuple]:
+        """
+        Rebuild tables with PAGE compression and report their data size before and after.
+        
+        New MSSQL schemas already create articles compressed; this converts tables
+        from older schemas. Text stored in row (titles, summaries, most article
+        bodies) is compressed; values pushed off row are not. The rebuild locks
+        each table while it runs. SQLite has no table compression, so nothing is done.
+        
+        Returns:
+            Dict mapping each table to its sp_spaceused data size before and after
+        """
+        invalid = set(tables) - _SCHEMA_OBJECTS
+        if invalid:
+            raise ValueError(f"Unknown tables: {', '.join(sorted(invalid))}")
+        if self.db_type != 'mssql':
+            logger.info("Table compression is only available on MSSQL")
+            return {}
+        
+        self.flush()
+        sizes = {}
+        try:
+            with self._ddl_connection() as conn:
+                cursor = conn.cursor()
+                for table in tables:
+                    cursor.execute("EXEC sp_spaceused ?", (table,))
+                    before = cursor.fetchone()[3]
+                    cursor.execute(f"ALTER TABLE [{table}] REBUILD PARTITION = ALL WITH (DATA_COMPRESSION = PAGE)")
+                    cursor.execute("EXEC sp_spaceused ?", (table,))
+                    after = cursor.fetchone()[3]
+                    sizes[table] = (before, after)
+                    logger.info(f"Compressed {table}: {before} -> {after}")
+        except Exception as e:
+            logger.error(f"Error compressing tables: {e}")
+        return sizes
     
     def close(self):
-        """Close database connections."""
-        pass  # Connections are managed by context manager
\ No newline at end of file
+        """Flush queued writes, wait for running backups and close all idle pooled connections."""
+        self._stop_flusher()
+        if self._backup_executor is not None:
+            self._backup_executor.shutdown(wait=True)
+            self._backup_executor = None
+        self._pool.close()
+        self._writer_pool.close()
\ No newline at end of file
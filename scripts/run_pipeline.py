@@ -61,17 +61,19 @@ def run_sentiment_analysis(articles):
         analyzer = NordicSentimentAnalyzer()
         db = DatabaseManager()
         
-        analyzed_count = 0
+        analyses = []
         for article in articles:
             # Analyze sentiment
             sentiment_result = analyzer.analyze_sentiment(
                 article['content'],
                 language=article['source_language']
             )
-            
-            # Save to database
-            if db.save_sentiment_analysis(article['id'], sentiment_result):
-                analyzed_count += 1
+            analyses.append({**sentiment_result, 'article_id': article['id']})
+        
+        # Save the articles and their analyses in one transaction
+        with db.transaction():
+            db.save_articles_bulk(articles)
+            analyzed_count = db.save_sentiment_analyses_bulk(analyses)
         
         logger.info(f"Analyzed sentiment for {analyzed_count} articles")
         return analyzed_count
@@ -88,11 +90,9 @@ def run_engagement_tracking():
         tracker = EngagementTracker()
         db = DatabaseManager()
         
-        # Get all articles
-        articles = db.get_articles(limit=1000)
-        
+        # Stream the articles rather than holding a thousand full rows at once
         updated_count = 0
-        for article in articles:
+        for article in db.iter_articles(limit=1000):
             # Get engagement metrics
             metrics = tracker.get_article_metrics(article['id'])
             if metrics:
@@ -241,20 +241,26 @@ def process_new_articles(articles):
         
         # Process sentiment analysis
         sentiment_analyzer = real_time_components['sentiment_analyzer']
+        analyzed = []
+        analyses = []
         for article in articles:
             try:
                 # Analyze sentiment
                 sentiment_result = sentiment_analyzer.analyze_article(article)
                 article.update(sentiment_result)
-                
-                # Store in database
-                db_manager = real_time_components['db_manager']
-                db_manager.store_article(article)
+                analyzed.append(article)
+                analyses.append({**sentiment_result, 'article_id': article['id']})
                 
             except Exception as e:
                 logger.error(f"Error processing article {article.get('title', 'Unknown')}: {e}")
                 continue
         
+        # Store the analyzed articles in database in one transaction
+        db_manager = real_time_components['db_manager']
+        with db_manager.transaction():
+            db_manager.save_articles_bulk(analyzed)
+            db_manager.save_sentiment_analyses_bulk(analyses)
+        
         # Update engagement metrics
         engagement_tracker = real_time_components['engagement_tracker']
         engagement_tracker.update_metrics()
@@ -56,20 +56,23 @@ def demo_real_time_collection():
         
         # Process sentiment analysis
         print("  🧠 Analyzing sentiment...")
+        analyses = []
         for article in articles:
             try:
                 sentiment_result = sentiment_analyzer.analyze_article(article)
                 article.update(sentiment_result)
+                analyses.append({**sentiment_result, 'article_id': article['id']})
             except Exception as e:
                 print(f"     ⚠️ Error analyzing article: {e}")
         
-        # Store in database
+        # Store in database, one batch per table
         print("  💾 Storing in database...")
-        for article in articles:
-            try:
-                db_manager.store_article(article)
-            except Exception as e:
-                print(f"     ⚠️ Error storing article: {e}")
+        try:
+            with db_manager.transaction():
+                db_manager.save_articles_bulk(articles)
+                db_manager.save_sentiment_analyses_bulk(analyses)
+        except Exception as e:
+            print(f"     ⚠️ Error storing articles: {e}")
         
         print("  ✅ Processing complete!")
     
@@ -37,7 +37,7 @@ def create_database(server, port, database_name, username, password, driver):
         cursor = conn.cursor()
         
         # Check if database exists
-        cursor.execute(f"SELECT name FROM sys.databases WHERE name = '{database_name}'")
+        cursor.execute("SELECT name FROM sys.databases WHERE name = ?", (database_name,))
         if cursor.fetchone():
             print(f"Database '{database_name}' already exists.")
         else:
@@ -59,8 +59,11 @@ def setup_tables(server, port, database_name, username, password, driver):
         conn = get_mssql_connection(server, port, database_name, username, password, driver)
         cursor = conn.cursor()
         
+        # Statements are collected and sent as one batch, a single round trip
+        statements = []
+        
         # Create articles table
-        cursor.execute("""
+        statements.append("""
             IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='articles' AND xtype='U')
             CREATE TABLE articles (
                 id NVARCHAR(255) PRIMARY KEY,
@@ -68,26 +71,26 @@ def setup_tables(server, port, database_name, username, password, driver):
                 url NVARCHAR(1000),
                 summary NVARCHAR(MAX),
                 content NVARCHAR(MAX),
-                published_date DATETIME2,
+                published_date DATETIME2(3),
                 source_name NVARCHAR(255),
                 source_country NVARCHAR(100),
                 source_language NVARCHAR(10),
                 author NVARCHAR(255),
                 tags NVARCHAR(MAX),
-                word_count INT,
-                collected_at DATETIME2,
-                created_at DATETIME2 DEFAULT GETDATE()
-            )
+                word_count AS CAST(CASE WHEN LEN(content) > 0 THEN LEN(content) - LEN(REPLACE(content, ' ', '')) + 1 ELSE 0 END AS INT) PERSISTED,
+                collected_at DATETIME2(3),
+                created_at DATETIME2(3) DEFAULT GETDATE()
+            ) WITH (DATA_COMPRESSION = PAGE)
         """)
         
         # Create unique index for URL separately
-        cursor.execute("""
+        statements.append("""
             IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_articles_url_unique')
             CREATE UNIQUE INDEX idx_articles_url_unique ON articles (url) WHERE url IS NOT NULL
         """)
         
         # Create sentiment_analysis table
-        cursor.execute("""
+        statements.append("""
             IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='sentiment_analysis' AND xtype='U')
             CREATE TABLE sentiment_analysis (
                 id INT IDENTITY(1,1) PRIMARY KEY,
@@ -100,32 +103,33 @@ def setup_tables(server, port, database_name, username, password, driver):
                 confidence FLOAT,
                 method NVARCHAR(100),
                 language NVARCHAR(10),
-                analyzed_at DATETIME2,
-                created_at DATETIME2 DEFAULT GETDATE(),
+                analyzed_at DATETIME2(3),
+                created_at DATETIME2(3) DEFAULT GETDATE(),
                 FOREIGN KEY (article_id) REFERENCES articles (id)
             )
         """)
         
         # Create engagement_events table
-        cursor.execute("""
+        statements.append("""
             IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='engagement_events' AND xtype='U')
             CREATE TABLE engagement_events (
                 id NVARCHAR(255) PRIMARY KEY,
                 user_id NVARCHAR(255),
                 article_id NVARCHAR(255),
                 event_type NVARCHAR(100),
-                timestamp DATETIME2,
+                timestamp DATETIME2(3),
                 session_id NVARCHAR(255),
                 country NVARCHAR(100),
                 device_type NVARCHAR(50),
                 metadata NVARCHAR(MAX),
-                created_at DATETIME2 DEFAULT GETDATE(),
+                time_spent AS CASE WHEN ISJSON(metadata) = 1 THEN TRY_CAST(JSON_VALUE(metadata, '$.time_spent') AS FLOAT) END PERSISTED,
+                created_at DATETIME2(3) DEFAULT GETDATE(),
                 FOREIGN KEY (article_id) REFERENCES articles (id)
             )
         """)
         
         # Create article_metrics table
-        cursor.execute("""
+        statements.append("""
             IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='article_metrics' AND xtype='U')
             CREATE TABLE article_metrics (
                 article_id NVARCHAR(255) PRIMARY KEY,
@@ -137,14 +141,14 @@ def setup_tables(server, port, database_name, username, password, driver):
                 ctr FLOAT DEFAULT 0,
                 share_rate FLOAT DEFAULT 0,
                 content_score FLOAT DEFAULT 0,
-                last_updated DATETIME2,
-                created_at DATETIME2 DEFAULT GETDATE(),
+                last_updated DATETIME2(3),
+                created_at DATETIME2(3) DEFAULT GETDATE(),
                 FOREIGN KEY (article_id) REFERENCES articles (id)
             )
         """)
         
         # Create ab_tests table
-        cursor.execute("""
+        statements.append("""
             IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='ab_tests' AND xtype='U')
             CREATE TABLE ab_tests (
                 id NVARCHAR(255) PRIMARY KEY,
@@ -152,14 +156,14 @@ def setup_tables(server, port, database_name, username, password, driver):
                 description NVARCHAR(MAX),
                 status NVARCHAR(50),
                 traffic_split FLOAT,
-                start_date DATETIME2,
-                end_date DATETIME2,
-                created_at DATETIME2 DEFAULT GETDATE()
+                start_date DATETIME2(3),
+                end_date DATETIME2(3),
+                created_at DATETIME2(3) DEFAULT GETDATE()
             )
         """)
         
         # Create ab_test_results table
-        cursor.execute("""
+        statements.append("""
             IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='ab_test_results' AND xtype='U')
             CREATE TABLE ab_test_results (
                 id INT IDENTITY(1,1) PRIMARY KEY,
@@ -171,18 +175,19 @@ def setup_tables(server, port, database_name, username, password, driver):
                 confidence_level FLOAT,
                 p_value FLOAT,
                 is_significant BIT,
-                created_at DATETIME2 DEFAULT GETDATE(),
+                created_at DATETIME2(3) DEFAULT GETDATE(),
                 FOREIGN KEY (test_id) REFERENCES ab_tests (id)
             )
         """)
         
         # Create indexes for better performance
-        cursor.execute("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_articles_published_date') CREATE INDEX idx_articles_published_date ON articles (published_date)")
-        cursor.execute("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_articles_source') CREATE INDEX idx_articles_source ON articles (source_name)")
-        cursor.execute("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_sentiment_article_id') CREATE INDEX idx_sentiment_article_id ON sentiment_analysis (article_id)")
-        cursor.execute("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_engagement_article_id') CREATE INDEX idx_engagement_article_id ON engagement_events (article_id)")
-        cursor.execute("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_engagement_timestamp') CREATE INDEX idx_engagement_timestamp ON engagement_events (timestamp)")
+        statements.append("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_articles_published_date') CREATE INDEX idx_articles_published_date ON articles (published_date)")
+        statements.append("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_articles_source') CREATE INDEX idx_articles_source ON articles (source_name)")
+        statements.append("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_sentiment_article_id') CREATE INDEX idx_sentiment_article_id ON sentiment_analysis (article_id)")
+        statements.append("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_engagement_article_id') CREATE INDEX idx_engagement_article_id ON engagement_events (article_id)")
+        statements.append("IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_engagement_timestamp') CREATE INDEX idx_engagement_timestamp ON engagement_events (timestamp)")
         
+        cursor.execute(";\n".join(statements))
         conn.commit()
         print("All tables and indexes created successfully.")
         
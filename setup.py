@@ -49,6 +49,15 @@ setup(
             "flake8>=6.1.0",
             "mypy>=1.5.0",
         ],
+        "http2": [
+            "httpx[http2]>=0.25.0",
+        ],
+        "speedups": [
+            "orjson>=3.9.0",
+        ],
+        "arrow": [
+            "pyarrow>=14.0.0",
+        ],
         "production": [
             "gunicorn>=21.2.0",
             "psycopg2-binary>=2.9.9",
@@ -0,0 +1,62 @@
+"""
+Unit tests for the async database manager module.
+"""
+
+import unittest
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.async_database_manager import AsyncDatabaseManager
+
+
+class TestAsyncDatabaseManager(unittest.TestCase):
+    """Test cases for the AsyncDatabaseManager class (SQLite backend)."""
+
+    def setUp(self):
+        """Point the manager at a throwaway SQLite database."""
+        self.original_cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+
+        self.config_path = os.path.join(self.tmpdir, 'config.yaml')
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            f.write("database:\n  development:\n    type: sqlite\n")
+
+    def tearDown(self):
+        """Remove the temporary database."""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_concurrent_saves(self):
+        """Test that gathered saves all land and reads are awaitable."""
+        async def run():
+            async with AsyncDatabaseManager(config_path=self.config_path) as db:
+                saved = await asyncio.gather(*(
+                    db.save_article({'id': f'a{i}', 'title': f'Article {i}'}, sync=True)
+                    for i in range(20)
+                ))
+                stats = await db.get_database_stats()
+                return saved, stats
+
+        saved, stats = asyncio.run(run())
+        self.assertEqual(saved, [True] * 20)
+        self.assertEqual(stats['total_articles'], 20)
+
+    def test_streaming_methods_not_wrapped(self):
+        """Test that generator methods are refused rather than run on the event loop."""
+        async def run():
+            async with AsyncDatabaseManager(config_path=self.config_path) as db:
+                with self.assertRaises(AttributeError):
+                    db.iter_articles_by_timeframe
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
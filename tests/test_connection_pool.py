@@ -0,0 +1,86 @@
+"""
+Unit tests for the connection pool module.
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection_pool import ConnectionPool
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test cases for the ConnectionPool class."""
+
+    def setUp(self):
+        """Set up a pool over mock connections."""
+        self.factory = mock.Mock(side_effect=lambda: mock.Mock())
+        self.pool = ConnectionPool(factory=self.factory, min_size=1, max_size=2, timeout=0.05)
+
+    def test_connections_reused(self):
+        """Test that released connections are handed out again."""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+
+        self.assertIs(self.pool.acquire(), conn)
+        self.assertEqual(self.factory.call_count, 1)
+
+    def test_exhausted_pool_times_out(self):
+        """Test that acquire gives up once max_size connections are checked out."""
+        self.pool.acquire()
+        self.pool.acquire()
+
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire()
+
+    def test_stale_connections_evicted(self):
+        """Test that idle connections are validated, and expired or dead ones replaced."""
+        self.pool.fill()
+        self.assertEqual(self.pool.idle, 1)
+
+        self.pool.validate_after = 0
+        conn = self.pool.acquire()
+        conn.execute.assert_called_once_with("SELECT 1")
+
+        conn.execute.side_effect = Exception("connection reset")
+        self.pool.release(conn)
+        replacement = self.pool.acquire()
+        self.assertIsNot(replacement, conn)
+        conn.close.assert_called_once()
+
+        self.pool.idle_timeout = 0
+        self.pool.release(replacement)
+        self.assertIsNot(self.pool.acquire(), replacement)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_unresettable_connection_discarded(self):
+        """Test that a connection whose reset fails is closed instead of pooled."""
+        on_close = mock.Mock()
+        pool = ConnectionPool(factory=self.factory, reset=mock.Mock(side_effect=Exception("reset")),
+                              on_close=on_close)
+        conn = pool.acquire()
+        pool.release(conn)
+
+        self.assertEqual(pool.size, 0)
+        on_close.assert_called_once_with(conn)
+        conn.close.assert_called_once()
+
+    def test_closed_pool_closes_returned_connections(self):
+        """Test that a connection checked out across close() is closed on release."""
+        conn = self.pool.acquire()
+        self.pool.close()
+        self.pool.release(conn)
+
+        conn.close.assert_called_once()
+        self.assertEqual(self.pool.size, 0)
+        self.assertEqual(self.pool.idle, 0)
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire()
+
+
+if __name__ == '__main__':
+    unittest.main()
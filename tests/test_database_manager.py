@@ -0,0 +1,1005 @@
+"""
+Unit tests for the database manager module.
+"""
+
+import unittest
+import sys
+import os
+import gc
+import hashlib
+import json
+import importlib.util
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import warnings
+import weakref
+from datetime import datetime
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyodbc
+
+from database.database_manager import DatabaseManager, _TOP_ARTICLES_SQL
+
+
+def _article(article_id, **overrides):
+    """Build an article dict shaped like the news collector's output."""
+    article = {
+        'id': article_id,
+        'title': f'Article {article_id}',
+        'url': f'https://www.vg.no/a/{article_id}',
+        'summary': 'Summary',
+        'content': 'Full article content',
+        'published_date': '2025-02-03T10:00:00',
+        'source_name': 'VG',
+        'source_country': 'Norway',
+        'source_language': 'no',
+        'author': 'Ola Nordmann',
+        'tags': ['Sport', 'Fotball'],
+        'word_count': 3,
+        'collected_at': '2025-02-03T10:05:00'
+    }
+    article.update(overrides)
+    return article
+
+
+class TestDatabaseManager(unittest.TestCase):
+    """Test cases for the DatabaseManager class (SQLite backend)."""
+
+    def setUp(self):
+        """Create a manager backed by a throwaway SQLite database."""
+        self.original_cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+
+        config_path = os.path.join(self.tmpdir, 'config.yaml')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write("database:\n  development:\n    type: sqlite\n")
+
+        self.db = DatabaseManager(config_path=config_path)
+
+    def tearDown(self):
+        """Remove the temporary database."""
+        self.db.close()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _switch_to_mssql(self):
+        """Treat the manager as MSSQL, dropping its pooled SQLite connections."""
+        self.db.db_type = 'mssql'
+        self.db._pool.close()
+        self.db._pool = self.db._create_pool()
+
+    def _switch_to_sqlite(self):
+        """Return the manager to SQLite, dropping its pooled MSSQL connections."""
+        self.db.db_type = 'sqlite'
+        self.db._pool.close()
+        self.db._pool = self.db._create_pool()
+
+    def test_schema_created_once(self):
+        """Test that reopening an initialised database skips the DDL script."""
+        self.db.save_article(_article('a1'), sync=True)
+
+        # A fresh process has no memo of initialised databases, so the catalog check decides
+        with mock.patch('database.database_manager._SQLITE_DDL', 'CREATE TABLE ddl_ran (id INTEGER);'), \
+                mock.patch('database.database_manager._SCHEMA_READY', set()):
+            reopened = DatabaseManager(config_path=os.path.join(self.tmpdir, 'config.yaml'))
+
+        with reopened.get_connection(readonly=True) as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        self.assertNotIn('ddl_ran', tables)
+        self.assertEqual(reopened.get_article('a1')['id'], 'a1')
+        reopened.close()
+
+    def test_schema_initialised_once_per_process(self):
+        """Test that later managers for the same database skip schema setup entirely."""
+        with mock.patch.object(DatabaseManager, '_create_tables_sqlite') as create_tables:
+            reopened = DatabaseManager(config_path=os.path.join(self.tmpdir, 'config.yaml'))
+            create_tables.assert_not_called()
+
+            reopened._initialize_database(force=True)
+            create_tables.assert_called_once()
+        reopened.close()
+
+    def test_empty_config_sections_use_defaults(self):
+        """Test that an empty development section falls back to the default settings."""
+        config_path = os.path.join(self.tmpdir, 'empty.yaml')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write("database:\n  development:\n")
+
+        manager = DatabaseManager(config_path=config_path)
+        self.assertEqual(manager.db_config, {})
+        self.assertEqual((manager.server, manager.port), ('localhost', 1433))
+        manager.close()
+
+    def test_sqlite_uses_wal(self):
+        """Test that the database is in WAL mode and connections are tuned."""
+        with self.db.get_connection(readonly=True) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 30000)
+            self.assertEqual(conn.execute("PRAGMA page_size").fetchone()[0], 8192)
+            self.assertEqual(conn.execute("PRAGMA mmap_size").fetchone()[0], 268435456)
+
+    def test_sqlite_connections_pooled(self):
+        """Test that SQLite readers are pooled and writers share one dedicated connection."""
+        with self.db.get_connection(readonly=True) as first:
+            self.assertEqual(self.db.pool_stats()['in_use'], 1)
+        with self.db.get_connection(readonly=True) as second:
+            self.assertIs(second, first)
+        with self.db.get_connection() as writer:
+            self.assertIsNot(writer, first)
+            self.assertEqual(writer.isolation_level, 'IMMEDIATE')
+            self.assertTrue(self.db.pool_stats()['writer_in_use'])
+        with self.db.get_connection() as again:
+            self.assertIs(again, writer)
+        self.assertEqual(self.db.pool_stats(),
+                         {'size': 1, 'idle': 1, 'in_use': 0, 'max_size': 10, 'writer_in_use': False})
+
+    def test_sqlite_reads_never_open_a_transaction(self):
+        """Test that SQLite readers stay in autocommit while the writer begins IMMEDIATE."""
+        for _ in range(2):
+            with self.db.get_connection(readonly=True) as conn:
+                self.assertIsNone(conn.isolation_level)
+                conn.execute("SELECT COUNT(*) FROM articles").fetchone()
+                self.assertFalse(conn.in_transaction)
+
+        with self.db.get_connection() as writer:
+            writer.execute("INSERT INTO engagement_users VALUES ('u1', 1)")
+            self.assertTrue(writer.in_transaction)
+        with self.db.get_connection() as writer:
+            self.assertEqual(writer.isolation_level, 'IMMEDIATE')
+            self.assertEqual(writer.execute("SELECT COUNT(*) FROM engagement_users").fetchone()[0], 0)
+
+    def test_sqlite_writers_serialised(self):
+        """Test that a second thread's write waits for the writer connection."""
+        order = []
+        with self.db.get_connection():
+            thread = threading.Thread(target=lambda: (self.db.save_article(_article('a1'), sync=True),
+                                                      order.append('second')))
+            thread.start()
+            thread.join(0.2)
+            order.append('first')
+        thread.join()
+        self.assertEqual(order, ['first', 'second'])
+        self.assertEqual(self.db.get_article('a1')['id'], 'a1')
+
+    def test_save_articles_bulk(self):
+        """Test that a batch of articles is stored with tags serialised as JSON."""
+        articles = [_article(f'a{i}') for i in range(2500)]
+
+        self.assertEqual(self.db.save_articles_bulk(articles), 2500)
+
+        stored = self.db.get_article('a42')
+        self.assertEqual(stored['title'], 'Article a42')
+        self.assertEqual(json.loads(stored['tags']), ['Sport', 'Fotball'])
+
+    def test_sqlite_bulk_inserts_use_multi_row_values(self):
+        """Test that SQLite bulk inserts send whole blocks as multi-row VALUES statements."""
+        cursor = mock.Mock()
+        rows = [(f'a{i}', 'u', 'view', None) for i in range(450)]
+        self.db._executemany(cursor, 'INSERT INTO t (a, b, c, d) VALUES (?, ?, ?, ?)', rows)
+
+        (block_sql, blocks), (tail_sql, tail) = [c.args for c in cursor.executemany.call_args_list]
+        self.assertEqual(block_sql.count('(?, ?, ?, ?)'), 200)
+        blocks = list(blocks)
+        self.assertEqual([len(block) for block in blocks], [800, 800])
+        self.assertEqual(blocks[1][:4], ('a200', 'u', 'view', None))
+        self.assertEqual((tail_sql, tail), ('INSERT INTO t (a, b, c, d) VALUES (?, ?, ?, ?)', rows[400:]))
+
+    def test_bulk_load_falls_back_to_batched_inserts(self):
+        """Test that bulk loading without a shared directory uses save_articles_bulk."""
+        with mock.patch.object(self.db, 'save_articles_bulk', wraps=self.db.save_articles_bulk) as bulk:
+            self.assertEqual(self.db.bulk_load_articles([_article('a1'), _article('a2')]), 2)
+        bulk.assert_called_once()
+        self.assertIsNotNone(self.db.get_article('a2'))
+
+    def test_save_articles_bulk_skips_existing(self):
+        """Test that saving an existing article keeps the stored row."""
+        self.assertTrue(self.db.save_article(_article('a1')))
+        self.assertTrue(self.db.save_article(_article('a1', title='Updated')))
+        self.assertEqual(self.db.save_articles_bulk([_article('a2'), _article('a2')]), 1)
+
+        self.assertEqual(self.db.get_article('a1')['title'], 'Article a1')
+
+    def test_update_article(self):
+        """Test that update_article refreshes whitelisted columns only."""
+        self.db.save_article(_article('a1'))
+
+        self.assertTrue(self.db.update_article('a1', {'title': 'Updated', 'tags': ['Politikk']}))
+        self.assertFalse(self.db.update_article('missing', {'title': 'Updated'}))
+        with self.assertRaises(ValueError):
+            self.db.update_article('a1', {'id': 'a2'})
+
+        stored = self.db.get_article('a1')
+        self.assertEqual(stored['title'], 'Updated')
+        self.assertEqual(json.loads(stored['tags']), ['Politikk'])
+
+    def test_articles_by_tag(self):
+        """Test that tags are stored one per row and follow update_article."""
+        self.db.save_articles_bulk([
+            _article('a1', published_date='2025-02-01T10:00:00'),
+            _article('a2', published_date='2025-02-02T10:00:00', tags=['Sport', 'Sport', 'Ski']),
+            _article('a3', tags='not a list')
+        ])
+        self.db.save_article(_article('a1', tags=['Ski']))
+
+        self.assertEqual([a['id'] for a in self.db.get_articles_by_tag('Sport')], ['a2', 'a1'])
+        self.assertEqual([a['id'] for a in self.db.get_articles_by_tag('Ski')], ['a2'])
+
+        self.db.update_article('a2', {'tags': ['Politikk']})
+        self.assertEqual([a['id'] for a in self.db.get_articles_by_tag('Sport')], ['a1'])
+        self.assertEqual([a['id'] for a in self.db.get_articles_by_tag('Politikk')], ['a2'])
+
+    def test_article_id_derived_from_url(self):
+        """Test that articles without an ID are keyed by the collector's URL hash."""
+        article = _article('a1', url='https://www.nrk.no/sport/1')
+        del article['id']
+
+        self.assertTrue(self.db.save_article(article, sync=True))
+        self.assertEqual(self.db.save_articles_bulk([article]), 1)
+
+        expected_id = hashlib.blake2b(b'https://www.nrk.no/sport/1', digest_size=8).hexdigest()
+        self.assertEqual(self.db.get_article(expected_id)['url'], 'https://www.nrk.no/sport/1')
+
+    def test_timestamps_normalised(self):
+        """Test that datetime and ISO string timestamps are stored in one format."""
+        self.db.save_articles_bulk([
+            _article('a1', published_date=datetime(2025, 2, 3, 10, 0)),
+            _article('a2', published_date='2025-02-03T11:00:00', collected_at='not a date')
+        ])
+
+        self.assertEqual(self.db.get_article('a1')['published_date'], '2025-02-03 10:00:00')
+        self.assertEqual(self.db.get_article('a2')['published_date'], '2025-02-03 11:00:00')
+        self.assertEqual(self.db.get_article('a2')['collected_at'], 'not a date')
+
+    def test_bulk_load_context_rebuilds_indexes(self):
+        """Test that secondary indexes are dropped for a backfill and restored after."""
+        def index_names():
+            with sqlite3.connect(self.db.db_path) as conn:
+                return {row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")}
+
+        before = index_names()
+        self.assertIn('idx_article_tags_tag', before)
+
+        with self.db.bulk_load_context():
+            self.assertNotIn('idx_article_tags_tag', index_names())
+            self.db.bulk_load_articles([_article('a1', tags=['Sport'])])
+
+        self.assertEqual(index_names(), before)
+        self.assertEqual([a['id'] for a in self.db.get_articles_by_tag('Sport')], ['a1'])
+
+    def test_bulk_load_ddl_runs_on_writer(self):
+        """Test that suspending and rebuilding indexes goes through the single writer connection."""
+        with mock.patch.object(self.db._pool, 'acquire', side_effect=AssertionError("reader used for DDL")), \
+                mock.patch.object(self.db._writer_pool, 'acquire', wraps=self.db._writer_pool.acquire) as writer:
+            with self.db.bulk_load_context():
+                pass
+        self.assertEqual(writer.call_count, 2)
+
+    def test_backfill_suspends_indexes_and_restores_statistics(self):
+        """Test that a backfill load runs without secondary indexes and re-analyses them."""
+        with mock.patch.object(self.db, 'bulk_load_context', wraps=self.db.bulk_load_context) as context:
+            self.assertEqual(self.db.bulk_load_articles([_article('a1'), _article('a2')], backfill=True), 2)
+        context.assert_called_once_with()
+
+        with self.db.get_connection(readonly=True) as conn:
+            analysed = {row[0] for row in conn.execute("SELECT idx FROM sqlite_stat1")}
+        self.assertIn('idx_article_tags_tag', analysed)
+
+    def test_save_articles_bulk_rolls_back_failed_batch(self):
+        """Test that one invalid article rolls back the whole batch."""
+        articles = [_article('a1'), _article('a2', title=None)]
+
+        self.assertEqual(self.db.save_articles_bulk(articles), 0)
+        self.assertIsNone(self.db.get_article('a1'))
+
+    def test_transaction_groups_writes(self):
+        """Test that writes inside transaction() commit together or not at all."""
+        with self.db.transaction():
+            self.db.save_articles_bulk([_article('a1')])
+            self.db.save_sentiment_analyses_bulk([{'article_id': 'a1', 'sentiment_score': 0.5}])
+            self.assertEqual(self.db.get_article('a1')['id'], 'a1')
+        self.assertEqual(self.db.get_database_stats()['total_sentiment_analyses'], 1)
+
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.save_articles_bulk([_article('a2')])
+                self.assertEqual(self.db.save_articles_bulk([_article('a3', title=None)]), 0)
+        self.assertIsNone(self.db.get_article('a2'))
+        self.assertEqual(self.db.get_database_stats()['total_articles'], 1)
+
+    def test_transaction_includes_queued_saves(self):
+        """Test that saves normally queued for the flusher are part of an open transaction."""
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.assertTrue(self.db.save_article(_article('a1')))
+                self.db.save_sentiment_analysis('a1', {'sentiment_score': 0.5})
+                self.db.save_engagement_event('a1', 'user_1', 'view')
+                self.assertEqual(self.db._queued_rows, 0)
+                raise ValueError("abort")
+
+        stats = self.db.get_database_stats()
+        self.assertEqual((stats['total_articles'], stats['total_sentiment_analyses'],
+                          stats['total_engagement_events']), (0, 0, 0))
+
+    def test_get_articles_paginates_newest_first(self):
+        """Test that get_articles pages through articles by publication date."""
+        self.db.save_articles_bulk([
+            _article(f'a{i}', published_date=f'2025-02-0{i}T10:00:00') for i in range(1, 6)
+        ])
+
+        page = self.db.get_articles(limit=2, offset=1)
+        self.assertEqual([article['id'] for article in page], ['a4', 'a3'])
+
+    def test_iter_articles_streams_in_batches(self):
+        """Test that iter_articles yields every article across fetch batches."""
+        self.db.save_articles_bulk([
+            _article(f'a{i}', published_date=f'2025-02-0{i}T10:00:00') for i in range(1, 6)
+        ])
+
+        streamed = self.db.iter_articles(batch_size=2)
+        self.assertEqual([article['id'] for article in streamed], ['a5', 'a4', 'a3', 'a2', 'a1'])
+        self.assertEqual([a['id'] for a in self.db.iter_articles(limit=2, offset=3)], ['a2', 'a1'])
+
+    def test_interleaved_streams_use_separate_connections(self):
+        """Test that a stream opened while another is suspended never shares its connection."""
+        self.db.save_articles_bulk([_article(f'a{i}') for i in range(3)])
+
+        first = self.db.iter_articles(batch_size=1)
+        second = self.db.iter_articles(batch_size=1)
+        next(first)
+        next(second)
+        self.assertEqual(self.db.pool_stats()['in_use'], 2)
+        self.assertEqual(len(list(first)), 2)
+        self.assertEqual(self.db.pool_stats()['in_use'], 1)
+        self.assertEqual(len(list(second)), 2)
+
+        self.assertEqual(self.db.pool_stats()['in_use'], 0)
+        self.assertEqual(getattr(self.db._local, 'depth', 0), 0)
+        with self.db.get_connection(readonly=True):
+            self.assertEqual(self.db._local.depth, 1)
+
+    def test_get_article_sentiment_returns_latest(self):
+        """Test that the newest sentiment analysis for an article is returned."""
+        self.db.save_article(_article('a1'))
+        self.db.save_sentiment_analysis('a1', {'sentiment_score': -0.2, 'sentiment_label': 'negative'})
+        self.db.save_sentiment_analysis('a1', {'sentiment_score': 0.7, 'sentiment_label': 'positive'})
+
+        self.assertEqual(self.db.get_article_sentiment('a1')['sentiment_label'], 'positive')
+        self.assertIsNone(self.db.get_article_sentiment('missing'))
+
+    def test_save_sentiment_analyses_bulk(self):
+        """Test that sentiment results are stored in chunks within one transaction."""
+        self.db.bulk_chunk_size = 100
+        self.db.save_article(_article('a1'))
+        analyses = [
+            {'article_id': 'a1', 'sentiment_score': 0.5, 'sentiment_label': 'positive'}
+            for _ in range(250)
+        ]
+
+        self.assertEqual(self.db.save_sentiment_analyses_bulk(analyses), 250)
+        self.assertEqual(self.db.save_sentiment_analyses_bulk(analyses + [{'sentiment_score': 0.1}]), 0)
+        self.assertEqual(self.db.get_database_stats()['total_sentiment_analyses'], 250)
+
+    def test_articles_by_timeframe_streamed(self):
+        """Test that recent articles stream in batches with their sentiment."""
+        self.db.save_articles_bulk([
+            _article(f'a{i}', collected_at=datetime.utcnow().isoformat(sep=' ')) for i in range(2100)
+        ] + [_article('old', collected_at='2020-01-01 00:00:00')])
+        self.db.save_sentiment_analysis('a1', {'sentiment_score': 0.4, 'sentiment_label': 'positive'})
+
+        articles = self.db.get_articles_by_timeframe(hours_back=1)
+        self.assertEqual(len(articles), 2100)
+        self.assertNotIn('old', {article['id'] for article in articles})
+        self.assertEqual(
+            next(article for article in articles if article['id'] == 'a1')['sentiment_label'], 'positive'
+        )
+        self.assertEqual(next(self.db.iter_articles_by_timeframe(hours_back=1))['source_name'], 'VG')
+
+    @unittest.skipIf(importlib.util.find_spec('pandas') is None, "pandas not installed")
+    def test_articles_frame(self):
+        """Test that recent articles load into a DataFrame with their sentiment."""
+        now = datetime.utcnow().isoformat(sep=' ')
+        self.db.save_articles_bulk([_article('a1', collected_at=now), _article('old', collected_at='2020-01-01')])
+        self.db.save_sentiment_analysis('a1', {'sentiment_score': 0.4, 'sentiment_label': 'positive'})
+
+        frame = self.db.get_articles_frame(hours_back=1)
+        self.assertEqual(list(frame['id']), ['a1'])
+        self.assertEqual(frame['sentiment_score'].mean(), 0.4)
+
+        nullable = self.db.get_articles_frame(hours_back=1, dtype_backend='numpy_nullable')
+        self.assertEqual(str(nullable['sentiment_score'].dtype), 'Float64')
+
+        # Inside a transaction the connection is a wrapper pandas would not accept without warning
+        with self.db.transaction(), warnings.catch_warnings():
+            warnings.simplefilter('error')
+            self.assertEqual(list(self.db.get_articles_frame(hours_back=1)['id']), ['a1'])
+
+        # Without the optional pyarrow the frame keeps NumPy dtypes; a failed query raises
+        with mock.patch.dict(sys.modules, {'pyarrow': None}):
+            fallback = self.db.get_articles_frame(hours_back=1, dtype_backend='pyarrow')
+        self.assertEqual(list(fallback['id']), ['a1'])
+        with mock.patch.object(self.db, '_timeframe_query', return_value=('SELECT * FROM missing', ())):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.db.get_articles_frame(hours_back=1)
+
+    def test_save_engagement_events_bulk(self):
+        """Test that a batch of engagement events is stored in one call."""
+        self.db.save_article(_article('a1'))
+        events = [
+            {'article_id': 'a1', 'user_id': f'user_{i % 10}', 'event_type': 'view'}
+            for i in range(1500)
+        ]
+        events.append({'article_id': 'a1', 'user_id': 'user_1', 'event_type': 'time_on_page',
+                       'metadata': {'time_spent': 30}})
+
+        self.assertEqual(self.db.save_engagement_events_bulk(events), 1501)
+        self.assertTrue(self.db.save_engagement_event('a1', 'user_2', 'click'))
+        self.db.flush()
+
+        metrics = self.db.get_engagement_metrics()
+        self.assertEqual(metrics['total_events'], 1502)
+        self.assertEqual(metrics['total_users'], 10)
+        self.assertEqual(metrics['avg_time_on_page'], 30)
+        self.assertEqual(metrics['engagement_rate'], 0.07)
+        self.assertEqual(metrics['total_events_24h'], 1502)
+
+    def test_serialised_metadata_stored_as_is(self):
+        """Test that metadata already serialised to JSON is not encoded a second time."""
+        self.db.save_article(_article('a1'))
+        self.db.save_engagement_events_bulk([
+            {'article_id': 'a1', 'event_type': 'time_on_page', 'metadata': '{"time_spent":20}'},
+            {'article_id': 'a1', 'event_type': 'time_on_page', 'metadata': b'{"time_spent":40}'},
+            {'article_id': 'a1', 'event_type': 'time_on_page', 'metadata': {'time_spent': 60}}
+        ])
+
+        with self.db.get_connection(readonly=True) as conn:
+            stored = [row[0] for row in conn.execute("SELECT metadata FROM engagement_events ORDER BY id")]
+        self.assertEqual(stored, ['{"time_spent":20}', '{"time_spent":40}', '{"time_spent":60}'])
+        self.assertEqual(self.db.get_engagement_metrics()['avg_time_on_page'], 40)
+
+    def test_time_spent_column_added_to_existing_table(self):
+        """Test that an events table from before time_spent gains it as a generated column."""
+        with self.db.get_connection() as conn:
+            conn.execute("DROP TABLE engagement_events")
+            conn.execute("""CREATE TABLE engagement_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, article_id TEXT NOT NULL, user_id TEXT,
+                event_type TEXT NOT NULL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, metadata TEXT)""")
+        self.db.save_article(_article('a1'))
+        self.db._initialize_database(force=True)
+
+        self.db.save_engagement_events_bulk([
+            {'article_id': 'a1', 'user_id': 'u1', 'event_type': 'time_on_page', 'metadata': {'time_spent': 12.5}},
+            {'article_id': 'a1', 'user_id': 'u2', 'event_type': 'view', 'metadata': {'time_spent': 99}},
+        ])
+        self.assertEqual(self.db.get_engagement_metrics()['avg_time_on_page'], 12.5)
+
+    def test_sentiment_data_aggregated(self):
+        """Test that the label distribution and average score come back together."""
+        self.db.save_article(_article('a1'))
+        self.db.save_sentiment_analyses_bulk([
+            {'article_id': 'a1', 'sentiment_score': 0.6, 'sentiment_label': 'positive'},
+            {'article_id': 'a1', 'sentiment_score': 0.2, 'sentiment_label': 'positive'},
+            {'article_id': 'a1', 'sentiment_score': None, 'sentiment_label': 'neutral'}
+        ])
+
+        data = self.db.get_sentiment_data()
+        self.assertEqual(data['sentiment_distribution'], {'positive': 2, 'neutral': 1})
+        self.assertEqual(data['average_sentiment_score'], 0.4)
+
+    def test_rollups_backfilled_for_existing_rows(self):
+        """Test that dashboard rollups added to a populated database count its existing rows."""
+        self.db.save_article(_article('a1'))
+        with self.db.get_connection() as conn:
+            for name in ('engagement_daily', 'engagement_users', 'sentiment_daily'):
+                conn.execute(f"DROP TABLE {name}")
+            conn.execute("DROP TRIGGER trg_engagement_rollup")
+            conn.execute("DROP TRIGGER trg_sentiment_rollup")
+            conn.execute("INSERT INTO engagement_events (article_id, user_id, event_type) VALUES ('a1', 'u1', 'view')")
+            conn.execute("INSERT INTO sentiment_analysis (article_id, sentiment_score) VALUES ('a1', 0.5)")
+            conn.commit()
+        self.db._initialize_database(force=True)
+
+        self.db.save_engagement_events_bulk([{'article_id': 'a1', 'user_id': 'u2', 'event_type': 'click'}])
+        self.db.save_sentiment_analyses_bulk([{'article_id': 'a1', 'sentiment_score': 0.1, 'sentiment_label': 'neutral'}])
+        metrics = self.db.get_engagement_metrics()
+        self.assertEqual((metrics['total_events'], metrics['total_users'], metrics['engagement_rate']), (2, 2, 100))
+        self.assertEqual(self.db.get_sentiment_data(), {
+            'sentiment_distribution': {None: 1, 'neutral': 1},
+            'average_sentiment_score': 0.3
+        })
+        self.assertEqual(self.db.get_database_stats(), {
+            'total_articles': 1,
+            'total_sentiment_analyses': 2,
+            'total_engagement_events': 2,
+            'unique_users': 2,
+            'average_sentiment_score': 0.3
+        })
+
+    def _rollup_rows(self):
+        """Snapshot the rollup tables for comparison against a rebuild."""
+        with self.db.get_connection(readonly=True) as conn:
+            return {
+                name: sorted(conn.execute(f"SELECT * FROM {name}").fetchall())
+                for name in ('engagement_daily', 'engagement_users', 'sentiment_daily')
+            }
+
+    def test_rollups_follow_deletes_and_updates(self):
+        """Test that deleted and updated events and analyses leave the rollups consistent."""
+        self.db.save_article(_article('a1'))
+        self.db.save_engagement_events_bulk([
+            {'article_id': 'a1', 'user_id': 'u1', 'event_type': 'view', 'metadata': {'time_spent': 30}},
+            {'article_id': 'a1', 'user_id': 'u1', 'event_type': 'click'},
+            {'article_id': 'a1', 'user_id': 'u2', 'event_type': 'view', 'metadata': {'time_spent': 10}}
+        ])
+        self.db.save_sentiment_analyses_bulk([
+            {'article_id': 'a1', 'sentiment_score': 0.8, 'sentiment_label': 'positive'},
+            {'article_id': 'a1', 'sentiment_score': -0.4, 'sentiment_label': 'negative'}
+        ])
+
+        with self.db.get_connection() as conn:
+            conn.execute("DELETE FROM engagement_events WHERE user_id = 'u2'")
+            conn.execute("UPDATE engagement_events SET event_type = 'share', timestamp = datetime('now', '-1 day') "
+                         "WHERE event_type = 'click'")
+            conn.execute("DELETE FROM sentiment_analysis WHERE sentiment_label = 'negative'")
+            conn.execute("UPDATE sentiment_analysis SET sentiment_score = 0.6")
+            conn.commit()
+        self.db.invalidate_cache()
+
+        self.assertEqual(self.db.get_database_stats(), {
+            'total_articles': 1,
+            'total_sentiment_analyses': 1,
+            'total_engagement_events': 2,
+            'unique_users': 1,
+            'average_sentiment_score': 0.6
+        })
+        rows = self._rollup_rows()
+        self.assertEqual(rows['engagement_users'], [('u1', 2)])
+        self.assertTrue(self.db.rebuild_rollups())
+        self.assertEqual(self._rollup_rows(), rows)
+
+    def test_rebuild_rollups_repairs_drift(self):
+        """Test that rebuilding, or upgrading from insert-only rollups, recounts the base tables."""
+        self.db.save_article(_article('a1'))
+        self.db.save_engagement_events_bulk([
+            {'article_id': 'a1', 'user_id': f'u{i}', 'event_type': 'view'} for i in range(3)
+        ])
+        with self.db.get_connection() as conn:
+            conn.execute("DROP TRIGGER trg_engagement_rollup_delete")
+            conn.execute("DELETE FROM engagement_events WHERE user_id = 'u0'")
+            conn.commit()
+        self.assertEqual(self.db.get_database_stats(refresh=True)['total_engagement_events'], 3)
+
+        self.assertTrue(self.db.rebuild_rollups())
+        stats = self.db.get_database_stats()
+        self.assertEqual((stats['total_engagement_events'], stats['unique_users']), (2, 2))
+
+        # A database from before per-user counts and the delete triggers
+        with self.db.get_connection() as conn:
+            conn.execute("DROP TRIGGER trg_engagement_rollup")
+            conn.execute("DROP TABLE engagement_users")
+            conn.execute("CREATE TABLE engagement_users (user_id TEXT PRIMARY KEY) WITHOUT ROWID")
+            conn.execute("INSERT INTO engagement_users VALUES ('u0'), ('u1'), ('u2')")
+            conn.execute("DELETE FROM engagement_events WHERE user_id = 'u1'")
+            conn.commit()
+        self.db._initialize_database(force=True)
+
+        stats = self.db.get_database_stats(refresh=True)
+        self.assertEqual((stats['total_engagement_events'], stats['unique_users']), (1, 1))
+        self.db.save_engagement_event('a1', 'u2', 'click')
+        self.db.flush()
+        self.assertEqual(self._rollup_rows()['engagement_users'], [('u2', 2)])
+
+    def test_idle_flusher_releases_manager(self):
+        """Test that a manager left unclosed is freed once its flusher goes idle."""
+        config_path = os.path.join(self.tmpdir, 'idle.yaml')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write("database:\n  development:\n    type: sqlite\n    flush_interval_ms: 1\n    flusher_idle_seconds: 0.05\n")
+        self.db.save_article(_article('a1'))
+
+        manager = DatabaseManager(config_path=config_path)
+        manager.save_engagement_event('a1', 'user_1', 'view')
+        thread = manager._flusher_thread
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+
+        ref = weakref.ref(manager)
+        del manager, thread
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(self.db.get_engagement_metrics()['total_events'], 1)
+
+        # A write after the flusher has exited starts a new one
+        self.db.flush_interval_ms, self.db.flusher_idle_seconds = 1, 0.05
+        self.db.save_engagement_event('a1', 'user_2', 'view')
+        self.db._flusher_thread.join(2)
+        self.assertEqual(self.db.get_engagement_metrics(refresh=True)['total_events'], 2)
+
+    def test_flush_ignores_writes_queued_after_it(self):
+        """Test that flush returns under steady event traffic and counts failed writes."""
+        self.db.save_article(_article('a1'))
+        self.db.flush_interval_ms = 1
+        written = []
+        save_events = self.db.save_engagement_events_bulk
+
+        def save_and_queue_more(events):
+            # Another thread keeps the queue busy while each batch is written
+            written.append(len(events))
+            if len(written) < 50:
+                self.db.save_engagement_event('a1', 'user_1', 'view')
+            return save_events(events)
+
+        with mock.patch.object(self.db, 'save_engagement_events_bulk', side_effect=save_and_queue_more):
+            self.db.save_engagement_event('a1', 'user_1', 'view')
+            self.db.flush()
+            self.assertLessEqual(len(written), 2)
+
+        self.db.flush()
+        with mock.patch.object(self.db, 'save_engagement_events_bulk', return_value=0):
+            self.assertTrue(self.db.save_engagement_event('a1', 'user_2', 'view'))
+            self.db.flush()
+        self.assertEqual(self.db.dropped_writes, 1)
+
+    def test_engagement_events_written_behind(self):
+        """Test that queued events are batched by the flusher and drained on close."""
+        self.db.save_article(_article('a1'))
+        with mock.patch.object(self.db, 'save_engagement_events_bulk',
+                               wraps=self.db.save_engagement_events_bulk) as bulk:
+            for i in range(250):
+                self.db.save_engagement_event('a1', f'user_{i}', 'view')
+            self.db.close()
+
+        self.assertLess(bulk.call_count, 250)
+        reopened = DatabaseManager(config_path=os.path.join(self.tmpdir, 'config.yaml'))
+        self.assertEqual(reopened.get_engagement_metrics()['total_events'], 250)
+        reopened.close()
+
+    def test_articles_written_behind(self):
+        """Test that queued articles are batched and visible to the next read."""
+        with mock.patch.object(self.db, 'save_articles_bulk',
+                               wraps=self.db.save_articles_bulk) as bulk:
+            for i in range(100):
+                self.assertTrue(self.db.save_article(_article(f'a{i}'), sync=False))
+            self.db.save_engagement_event('a99', 'user_1', 'view')
+
+            self.assertEqual(self.db.get_article('a99')['title'], 'Article a99')
+        self.assertLess(bulk.call_count, 100)
+
+        self.db.save_article(_article('ok'), sync=False)
+        self.db.save_article(_article('bad', title=None), sync=False)
+        self.assertIsNotNone(self.db.get_article('ok'))
+        self.assertFalse(self.db.save_article(_article('bad', title=None)))
+
+        self.db.save_sentiment_analysis('a1', {'sentiment_score': 0.2, 'sentiment_label': 'neutral'}, sync=False)
+        self.assertEqual(self.db.get_article_sentiment('a1')['sentiment_label'], 'neutral')
+
+        self.db.flush()
+        self.assertEqual(self.db.get_engagement_metrics()['total_events'], 1)
+
+    def test_database_stats_cached_until_write(self):
+        """Test that stats are served from cache and refreshed after a save."""
+        self.assertEqual(self.db.get_database_stats()['total_articles'], 0)
+
+        with mock.patch.object(self.db, 'get_connection', side_effect=AssertionError("cache miss")):
+            self.assertEqual(self.db.get_database_stats()['total_articles'], 0)
+
+        self.db.save_article(_article('a1'))
+        self.db.save_sentiment_analysis('a1', {'sentiment_score': 0.5, 'sentiment_label': 'positive'})
+
+        stats = self.db.get_database_stats()
+        self.assertEqual(stats['total_articles'], 1)
+        self.assertEqual(stats['total_sentiment_analyses'], 1)
+        self.assertEqual(stats['average_sentiment_score'], 0.5)
+
+    def test_cached_results_copied_for_callers(self):
+        """Test that mutating a cached result's rows or nested dicts leaves the cache intact."""
+        self.db.save_article(_article('a1'))
+        self.db.save_sentiment_analysis('a1', {'sentiment_score': 0.5, 'sentiment_label': 'positive'})
+
+        articles = self.db.get_articles()
+        articles[0]['title'] = 'Changed'
+        articles.append({})
+        sentiment = self.db.get_sentiment_data()
+        sentiment['sentiment_distribution']['positive'] = 99
+
+        self.assertEqual([row['title'] for row in self.db.get_articles()], ['Article a1'])
+        self.assertEqual(self.db.get_sentiment_data()['sentiment_distribution'], {'positive': 1})
+
+    def test_cached_read_refreshed_on_request(self):
+        """Test that refresh=True re-runs a cached read and stores the new result."""
+        self.assertEqual(self.db.get_database_stats()['total_articles'], 0)
+        with self.db.get_connection() as conn:
+            conn.execute("INSERT INTO articles (id, title) VALUES ('a1', 'Written elsewhere')")
+            conn.commit()
+
+        self.assertEqual(self.db.get_database_stats()['total_articles'], 0)
+        self.assertEqual(self.db.get_database_stats(refresh=True)['total_articles'], 1)
+        self.assertEqual(self.db.get_database_stats()['total_articles'], 1)
+
+    def test_cache_invalidated_per_table(self):
+        """Test that writes only drop cached reads of the tables they touch."""
+        self.db.save_article(_article('a1'))
+        self.assertEqual(len(self.db.get_articles()), 1)
+        self.db.get_sentiment_data()
+
+        self.db.save_engagement_events_bulk([{'article_id': 'a1', 'user_id': 'u1', 'event_type': 'view'}])
+        with mock.patch.object(self.db, 'get_connection', side_effect=AssertionError("cache miss")):
+            self.assertEqual(len(self.db.get_articles()), 1)
+            self.db.get_sentiment_data()
+
+        self.db.save_article(_article('a2'))
+        self.assertEqual(len(self.db.get_articles()), 2)
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache keeps at most cache_max_entries results."""
+        self.db.cache_max_entries = 2
+        for limit in (1, 2, 1, 3):
+            self.db.get_articles(limit)
+
+        self.assertEqual([key[1] for key in self.db._cache], [(1,), (3,)])
+
+    def test_concurrent_cache_misses_share_one_query(self):
+        """Test that simultaneous stats requests wait for a single refresh."""
+        get_connection = self.db.get_connection
+
+        def slow_connection(*args, **kwargs):
+            time.sleep(0.1)
+            return get_connection(*args, **kwargs)
+
+        with mock.patch.object(self.db, 'get_connection', side_effect=slow_connection) as connect:
+            threads = [threading.Thread(target=self.db.get_database_stats) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(connect.call_count, 1)
+
+    def test_trends_use_time_window(self):
+        """Test that trend queries bind their time window and count recent rows."""
+        self.db.save_article(_article('a1'))
+        self.db.save_engagement_events_bulk([{'article_id': 'a1', 'event_type': 'view'}] * 3)
+        self.db.save_sentiment_analysis('a1', {'sentiment_score': 0.4, 'sentiment_label': 'positive'})
+
+        engagement = self.db.get_engagement_trends(days=7)
+        sentiment = self.db.get_sentiment_trends(days=7)
+
+        self.assertEqual([(row['event_type'], row['count']) for row in engagement], [('view', 3)])
+        self.assertEqual([(row['sentiment_label'], row['count']) for row in sentiment], [('positive', 1)])
+        self.assertEqual(self.db.get_engagement_trends(days="7 days'); DROP TABLE articles; --"), [])
+        self.assertEqual(self.db.get_database_stats()['total_articles'], 1)
+
+    def test_trends_read_daily_rollups(self):
+        """Test that trends combine rollup days with the partial first day of the window."""
+        self.db.save_article(_article('a1'))
+        with self.db.get_connection() as conn:
+            for offset in ('-3 days', '-8 days', '-2 days', '-2 days', '-4 days'):
+                conn.execute("INSERT INTO engagement_events (article_id, event_type, timestamp) "
+                             "VALUES ('a1', 'view', datetime('now', ?))", (offset,))
+            conn.execute("INSERT INTO sentiment_analysis (article_id, sentiment_score, sentiment_label, created_at) "
+                         "VALUES ('a1', 0.2, 'positive', datetime('now', '-2 days')), "
+                         "('a1', 0.6, 'positive', datetime('now', '-2 days'))")
+            conn.commit()
+
+        engagement = self.db.get_engagement_trends(days=3.5)
+        self.assertEqual(sum(row['count'] for row in engagement), 3)
+        self.assertEqual(engagement[0]['count'], 2)
+        sentiment = self.db.get_sentiment_trends(days=3.5)
+        self.assertEqual([(row['sentiment_label'], row['count']) for row in sentiment], [('positive', 2)])
+        self.assertAlmostEqual(sentiment[0]['avg_score'], 0.4)
+
+        with self.db.get_connection(readonly=True) as conn:
+            plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT event_type, COUNT(*) FROM engagement_events "
+                "WHERE DATE(timestamp) = DATE('now', ?) AND timestamp >= datetime('now', ?) "
+                "GROUP BY DATE(timestamp), event_type", ('-3.5 days', '-3.5 days')))
+        self.assertIn('SEARCH engagement_events USING COVERING INDEX idx_engagement_date_type', plan)
+
+    def test_timeframe_query_text_is_stable(self):
+        """Test that the time window is bound, so every window shares one statement."""
+        for db_type in ('sqlite', 'mssql'):
+            self.db.db_type = db_type
+            day_sql, day_params = self.db._timeframe_query(24)
+            week_sql, week_params = self.db._timeframe_query(168)
+            self.assertEqual(day_sql, week_sql)
+            self.assertNotEqual(day_params, week_params)
+        self.db.db_type = 'sqlite'
+
+    def test_timeframe_query_uses_index(self):
+        """Test that the timeframe window range-scans collected_at instead of the table."""
+        with self.db.get_connection(readonly=True) as conn:
+            sql, params = self.db._timeframe_query(24)
+            plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        self.assertIn('idx_articles_collected', plan[0])
+
+    def test_every_ranking_metric_indexed(self):
+        """Test that ranking by any whitelisted metric walks its index instead of sorting."""
+        with self.db.get_connection(readonly=True) as conn:
+            plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + _TOP_ARTICLES_SQL['sqlite', 'shares'], (5,))]
+        self.assertIn('idx_metrics_shares', plan[0])
+        self.assertFalse(any('TEMP B-TREE' in step for step in plan))
+
+    def test_top_articles_ranked_by_metric(self):
+        """Test that article metrics are upserted and ranked by a whitelisted column."""
+        self.db.save_articles_bulk([_article('a1'), _article('a2'), _article('a3')])
+        self.assertTrue(self.db.update_article_metrics('a1', {'total_views': 10, 'ctr': 0.1}))
+        self.assertTrue(self.db.update_article_metrics('a2', {'total_views': 10, 'ctr': 0.3}))
+        self.assertTrue(self.db.update_article_metrics('a3', {'total_views': 10, 'ctr': 0.2}))
+        self.assertTrue(self.db.update_article_metrics('a1', {'total_views': 20, 'ctr': 0.5}))
+
+        top = self.db.get_top_articles(metric='ctr', limit=2)
+        self.assertEqual([(row['id'], row['ctr']) for row in top], [('a1', 0.5), ('a2', 0.3)])
+
+        with self.assertRaises(ValueError):
+            self.db.get_top_articles(metric='ctr; DROP TABLE articles')
+
+    def test_article_metrics_updated_in_place(self):
+        """Test that a repeat metrics snapshot updates the row instead of replacing it."""
+        self.db.save_articles_bulk([_article('a1')])
+        self.db.update_article_metrics('a1', {'total_views': 10})
+        query = "SELECT rowid, created_at FROM article_metrics WHERE article_id = 'a1'"
+        with self.db.get_connection(readonly=True) as conn:
+            conn.execute("UPDATE article_metrics SET created_at = '2020-01-01 00:00:00'")
+            conn.commit()
+            before = conn.execute(query).fetchone()
+
+        self.db.update_article_metrics('a1', {'total_views': 20})
+        with self.db.get_connection(readonly=True) as conn:
+            self.assertEqual(conn.execute(query).fetchone(), before)
+            self.assertEqual(conn.execute("SELECT total_views FROM article_metrics").fetchone()[0], 20)
+
+    def test_ranking_and_trend_statements_reused(self):
+        """Test that varying the metric limit or trend window never changes the statement text."""
+        cursor = mock.Mock()
+        with mock.patch.object(self.db, '_cursor', return_value=cursor):
+            for days in (7, 30):
+                self.db.get_engagement_trends(days=days)
+                self.db.get_sentiment_trends(days=days)
+                self.db.get_top_articles(metric='ctr', limit=days)
+
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        self.assertEqual(len(statements), 6)
+        self.assertEqual(statements[:3], statements[3:])
+        self.assertNotEqual(cursor.execute.call_args_list[0].args[1], cursor.execute.call_args_list[3].args[1])
+
+    def test_backup_database(self):
+        """Test that backups run in the background and copy queued writes."""
+        self.db.save_article(_article('a1'))
+        backup_path = os.path.join(self.tmpdir, 'backups', 'copy.db')
+
+        future = self.db.backup_database(backup_path, wait=False)
+        self.assertTrue(future.result())
+        self.assertEqual(self.db.backup_status(future)['percent_complete'], 100.0)
+        self.assertTrue(self.db.backup_database())
+
+        with sqlite3.connect(backup_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0], 1)
+        conn.close()
+
+        with self.assertRaises(ValueError):
+            self.db.backup_database("x.bak'\nDROP DATABASE nordic_news_dev --")
+
+    def test_compress_tables(self):
+        """Test that compression is refused for unknown tables and skipped on SQLite."""
+        with self.assertRaises(ValueError):
+            self.db.compress_tables(('articles; DROP TABLE articles',))
+        self.assertEqual(self.db.compress_tables(), {})
+
+    def test_mssql_word_count_computed_server_side(self):
+        """Test that MSSQL rows leave word_count to the computed column."""
+        self._switch_to_mssql()
+
+        row = self.db._article_row(_article('a1', word_count=3))
+        self.assertEqual(len(row), 12)
+        self.assertEqual(row[10], '["Sport","Fotball"]')
+        with self.assertRaises(ValueError):
+            self.db.update_article('a1', {'word_count': 5})
+
+    def test_mssql_database_created_only_when_missing(self):
+        """Test that startup skips the master connection unless the database is missing."""
+        self._switch_to_mssql()
+        missing = pyodbc.Error('42000', 'Cannot open database "nordic_news_dev" requested by the login. (4060)')
+        connect = mock.Mock(side_effect=lambda: mock.Mock(autocommit=False))
+        with mock.patch.object(self.db, '_connect_mssql', connect), \
+                mock.patch.object(self.db, '_create_tables_mssql'), \
+                mock.patch.object(self.db, '_ensure_mssql_database_exists') as ensure:
+            self.db._initialize_database(force=True)
+            ensure.assert_not_called()
+
+            self.db._pool.close()
+            self.db._pool = self.db._create_pool()
+            connect.side_effect = [missing, mock.Mock(autocommit=False)]
+            self.db._initialize_database(force=True)
+            ensure.assert_called_once()
+        self.assertEqual(self.db.db_type, 'mssql')
+        self._switch_to_sqlite()
+
+    def test_mssql_bulk_strings_bound_in_parameter_arrays(self):
+        """Test that fast_executemany chunks size short string columns instead of binding MAX."""
+        self._switch_to_mssql()
+        self.db.bulk_chunk_size = 2
+        cursor = mock.Mock()
+        rows = [('a1', 'u1', 'view', None), ('a2', None, 'click', '{"x":1}'), ('a3', 'u3', 'x' * 3000, None)]
+
+        self.db._executemany(cursor, 'INSERT ...', rows)
+
+        self.assertTrue(cursor.fast_executemany)
+        self.assertEqual(cursor.setinputsizes.call_args_list, [
+            mock.call([(pyodbc.SQL_WVARCHAR, 4, 0), (pyodbc.SQL_WVARCHAR, 4, 0),
+                       (pyodbc.SQL_WVARCHAR, 10, 0), (pyodbc.SQL_WVARCHAR, 14, 0)]),
+            mock.call([(pyodbc.SQL_WVARCHAR, 4, 0), (pyodbc.SQL_WVARCHAR, 4, 0), None, None]),
+            mock.call(None)
+        ])
+        self.assertEqual(cursor.executemany.call_count, 2)
+        self._switch_to_sqlite()
+
+    def test_mssql_connections_pooled(self):
+        """Test that MSSQL connections are reused and broken ones discarded."""
+        self._switch_to_mssql()
+        connect_mssql = lambda: mock.Mock(cursor=mock.Mock(side_effect=mock.Mock))
+        with mock.patch.object(self.db, '_connect_mssql', side_effect=connect_mssql) as connect:
+            with self.db.get_connection() as first:
+                pass
+            with self.db.get_connection() as second:
+                pass
+            self.assertIs(first, second)
+            self.assertEqual(connect.call_count, 1)
+            self.assertIs(self.db._cursor(second), self.db._cursor(second))
+            insert_cursor = self.db._cursor(second, 'INSERT ...')
+            self.assertIsNot(insert_cursor, self.db._cursor(second))
+            self.assertIs(self.db._cursor(second, 'INSERT ...'), insert_cursor)
+
+            second.rollback.side_effect = Exception("connection reset")
+            with self.db.get_connection():
+                pass
+            self.assertEqual(self.db._pool.size, 0)
+            self.assertNotIn(second, self.db._cursors)
+            second.close.assert_called_once()
+        self.db.db_type = 'sqlite'
+
+    def test_mssql_connection_bound_to_thread(self):
+        """Test that nested calls share a thread's connection and other threads get their own."""
+        self._switch_to_mssql()
+        connect = lambda: mock.Mock(autocommit=False, cursor=mock.Mock(side_effect=mock.Mock))
+        with mock.patch.object(self.db, '_connect_mssql', side_effect=connect):
+            with self.db.get_connection() as outer:
+                outer_cursor = self.db._cursor(outer)
+                with self.db.get_connection() as inner:
+                    self.assertIs(inner, outer)
+                    self.assertIsNot(self.db._cursor(inner), outer_cursor)
+
+                other = []
+                thread = threading.Thread(target=lambda: other.append(self.db.get_connection().__enter__()))
+                thread.start()
+                thread.join()
+                self.assertIsNot(other[0], outer)
+            self.assertEqual(self.db._pool.size, 2)
+        self.assertIn('MARS_Connection=yes;', self.db._get_connection_string())
+        self.db.db_type = 'sqlite'
+
+    def test_mssql_readonly_connection_autocommits(self):
+        """Test that reads run in autocommit and nested writes get their own transaction."""
+        self._switch_to_mssql()
+        connect = lambda: mock.Mock(autocommit=False)
+        with mock.patch.object(self.db, '_connect_mssql', side_effect=connect):
+            with self.db.get_connection(readonly=True) as reader:
+                self.assertTrue(reader.autocommit)
+                with self.db.get_connection() as writer:
+                    self.assertIsNot(writer, reader)
+                    self.assertFalse(writer.autocommit)
+                with self.db.get_connection(readonly=True) as nested:
+                    self.assertIs(nested, reader)
+
+            self.assertFalse(reader.autocommit)
+            reader.rollback.assert_not_called()
+        self.db.db_type = 'sqlite'
+
+
+if __name__ == '__main__':
+    unittest.main()
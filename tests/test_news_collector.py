@@ -0,0 +1,235 @@
+"""
+Unit tests for the news collector module.
+"""
+
+import unittest
+import sys
+import os
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_pipeline.news_collector import NewsCollector, ContentDedupTracker, _DISPATCH_STOP, _parse_feed_xml
+
+
+def _local(*args):
+    """Convert a UTC timestamp to the naive local time the collector returns."""
+    return datetime(*args, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+class TestNewsCollector(unittest.TestCase):
+    """Test cases for the NewsCollector class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.collector = NewsCollector()
+
+    def tearDown(self):
+        """Release the collector's scraper pool, HTTP session and dispatcher."""
+        self.collector.close()
+
+    def test_parse_date_rfc822(self):
+        """Test parsing RSS 2.0 dates with numeric and named offsets."""
+        self.assertEqual(
+            self.collector._parse_date('Mon, 03 Feb 2025 10:00:00 +0100'),
+            _local(2025, 2, 3, 9, 0, 0)
+        )
+        self.assertEqual(
+            self.collector._parse_date('Mon, 3 Feb 2025 10:00:00 GMT'),
+            _local(2025, 2, 3, 10, 0, 0)
+        )
+
+    def test_parse_date_iso8601(self):
+        """Test parsing Atom/ISO 8601 dates."""
+        self.assertEqual(
+            self.collector._parse_date('2025-02-03T10:00:00.123+02:00'),
+            _local(2025, 2, 3, 8, 0, 0)
+        )
+        self.assertEqual(
+            self.collector._parse_date('2025-02-03 10:00:00'),
+            datetime(2025, 2, 3, 10, 0, 0)
+        )
+
+    def test_parse_date_invalid(self):
+        """Test that unparseable dates return None."""
+        self.assertIsNone(self.collector._parse_date(''))
+        self.assertIsNone(self.collector._parse_date('not a date'))
+        self.assertIsNone(self.collector._parse_date('2025-02-30T10:00:00'))
+
+    def test_generate_article_id(self):
+        """Test that article IDs are short, stable and URL-specific."""
+        article_id = self.collector._generate_article_id('https://www.vg.no/a/1')
+
+        self.assertEqual(len(article_id), 16)
+        self.assertEqual(article_id, self.collector._generate_article_id('https://www.vg.no/a/1'))
+        self.assertNotEqual(article_id, self.collector._generate_article_id('https://www.vg.no/a/2'))
+
+    def test_learn_selector_pins_most_common_match(self):
+        """Test that a source's content selector is learned from its first articles."""
+        source = {'name': 'VG'}
+        for _ in range(7):
+            self.collector._learn_selector(source, '.article-body')
+        self.assertNotIn('content_selector', source)
+
+        for selector in ('article', 'article', None):
+            self.collector._learn_selector(source, selector)
+        self.assertEqual(source['content_selector'], '.article-body')
+
+    def test_callbacks_dispatched_off_collection_thread(self):
+        """Test that callbacks receive batches on the dispatcher thread."""
+        received = []
+        self.collector.add_callback(lambda batch: received.append((batch, threading.current_thread())))
+
+        self.collector._notify_callbacks([{'id': 'a'}])
+        self.collector._stop_dispatcher()
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0][0], [{'id': 'a'}])
+        self.assertIsNot(received[0][1], threading.current_thread())
+
+    def test_full_callback_queue_drops_oldest_batch(self):
+        """Test that a full callback queue discards the oldest batch instead of blocking."""
+        self.collector._out_q = queue.Queue(maxsize=2)
+        for batch_id in range(3):
+            self.collector._enqueue([{'id': batch_id}])
+
+        self.assertEqual(self.collector.dropped_batches, 1)
+        self.assertEqual(self.collector._out_q.get_nowait(), [{'id': 1}])
+
+    def test_full_callback_queue_keeps_stop_request(self):
+        """Test that a batch arriving behind a pending stop request is dropped and counted."""
+        self.collector._out_q = queue.Queue(maxsize=1)
+        self.collector._enqueue(_DISPATCH_STOP)
+        self.collector._enqueue([{'id': 1}])
+
+        self.assertEqual(self.collector.dropped_batches, 1)
+        self.assertIs(self.collector._out_q.get_nowait(), _DISPATCH_STOP)
+        self.assertTrue(self.collector._out_q.empty())
+
+    def test_article_fetches_rate_limited_per_host(self):
+        """Test that concurrent article scrapes to one host are spaced by the rate limit."""
+        self.collector.rate_limit_delay = 0.05
+        started = []
+
+        def read_capped(url):
+            started.append(time.monotonic())
+            return b'<article>Story</article>'
+
+        self.collector._read_capped = read_capped
+        urls = [f'https://www.vg.no/a/{i}' for i in range(3)]
+        self.assertEqual(self.collector._scrape_many(urls), ['Story'] * 3)
+
+        started.sort()
+        for earlier, later in zip(started, started[1:]):
+            self.assertGreaterEqual(later - earlier, 0.045)
+
+    def test_duplicates_dropped_per_collection_cycle(self):
+        """Test that dedup spans one cycle, plus only stories callbacks accepted."""
+        story = {'title': 'Danish government announces new offshore wind investment', 'summary': ''}
+        other = {'title': 'Finnish parliament debates new climate legislation', 'summary': ''}
+
+        self.assertEqual(self.collector._drop_duplicates([story, dict(story)], False), [story])
+        self.assertEqual(self.collector._drop_duplicates([story], True), [story])
+
+        def failing_save(batch):
+            raise RuntimeError("database unavailable")
+
+        self.collector.add_callback(failing_save)
+        self.collector._notify_callbacks([story])
+        self.collector._stop_dispatcher()
+        self.assertEqual(self.collector._drop_duplicates([story], True), [story])
+
+        self.collector.remove_callback(failing_save)
+        self.collector._notify_callbacks([story])
+        self.collector._stop_dispatcher()
+        self.assertEqual(self.collector._drop_duplicates([story, other], True), [other])
+        self.assertEqual(self.collector._drop_duplicates([story], False), [story])
+
+
+class TestFeedParsing(unittest.TestCase):
+    """Test cases for the ElementTree feed parser."""
+
+    def test_rss_items(self):
+        """Test that RSS items map to feedparser-style entries."""
+        entries = _parse_feed_xml(
+            b'<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+            b'<item><title>Hei &amp; hallo</title><link>https://www.vg.no/a/1</link>'
+            b'<description>Kort sammendrag</description>'
+            b'<pubDate>Mon, 03 Feb 2025 10:00:00 +0100</pubDate>'
+            b'<dc:creator>Ola Nordmann</dc:creator><category>Sport</category></item>'
+            b'</channel></rss>'
+        )
+
+        self.assertEqual(entries, [{
+            'tags': [{'term': 'Sport'}],
+            'title': 'Hei & hallo',
+            'link': 'https://www.vg.no/a/1',
+            'summary': 'Kort sammendrag',
+            'published': 'Mon, 03 Feb 2025 10:00:00 +0100',
+            'author': 'Ola Nordmann'
+        }])
+
+    def test_atom_entries(self):
+        """Test that Atom entries use the alternate link and fall back to the updated date."""
+        entries = _parse_feed_xml(
+            b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>Uutiset</title>'
+            b'<link rel="self" href="https://yle.fi/feed/1"/><link href="https://yle.fi/a/1"/>'
+            b'<updated>2025-02-03T10:00:00Z</updated><summary>Tiivistelm\xc3\xa4</summary>'
+            b'<author><name>Kari</name></author><category term="uutiset"/></entry></feed>'
+        )
+
+        self.assertEqual(entries[0]['link'], 'https://yle.fi/a/1')
+        self.assertEqual(entries[0]['published'], '2025-02-03T10:00:00Z')
+        self.assertEqual(entries[0]['summary'], 'Tiivistelm\xe4')
+        self.assertEqual(entries[0]['author'], 'Kari')
+        self.assertEqual(entries[0]['tags'], [{'term': 'uutiset'}])
+
+    def test_non_feed_rejected(self):
+        """Test that malformed or non-feed documents raise ParseError for the feedparser fallback."""
+        with self.assertRaises(ET.ParseError):
+            _parse_feed_xml(b'<rss><channel><item>&nbsp;</item></channel></rss>')
+        with self.assertRaises(ET.ParseError):
+            _parse_feed_xml(b'<html><body>Not a feed</body></html>')
+
+
+class TestContentDedupTracker(unittest.TestCase):
+    """Test cases for the ContentDedupTracker class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tracker = ContentDedupTracker()
+
+    def test_near_duplicate_detected(self):
+        """Test that a lightly reworded story is flagged as a duplicate."""
+        original = ("Norway's central bank raises interest rates to 4.5 percent amid "
+                    "inflation concerns, governor says further hikes possible this autumn")
+        reworded = ("Norway's central bank raises interest rates to 4.5 percent amid "
+                    "inflation concerns, governor says further hikes likely this autumn")
+
+        self.assertFalse(self.tracker.is_duplicate(original))
+        self.assertTrue(self.tracker.is_duplicate(reworded))
+
+    def test_distinct_stories_kept(self):
+        """Test that unrelated stories and empty texts are not flagged."""
+        self.assertFalse(self.tracker.is_duplicate("Swedish football team wins championship in Stockholm"))
+        self.assertFalse(self.tracker.is_duplicate("Finnish parliament debates new climate legislation"))
+        self.assertFalse(self.tracker.is_duplicate(""))
+        self.assertFalse(self.tracker.is_duplicate(""))
+
+    def test_oldest_fingerprints_evicted(self):
+        """Test that a bounded tracker forgets its oldest stories."""
+        tracker = ContentDedupTracker(max_entries=1)
+        first = "Danish government announces new offshore wind investment"
+
+        self.assertFalse(tracker.is_duplicate(first))
+        self.assertFalse(tracker.is_duplicate("Finnish ice hockey team reaches world championship final"))
+        self.assertFalse(tracker.is_duplicate(first))
+
+
+if __name__ == '__main__':
+    unittest.main()